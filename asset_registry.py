@@ -0,0 +1,163 @@
+import os
+import struct
+import hashlib
+import pygame as pg
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class AssetRegistry:
+    """Registre d'assets partagé par tous les jeux.
+
+    Chaque image (ou police) est chargée une seule fois et gardée en mémoire,
+    indexée par (chemin, taille, alpha). Si cache_dir est défini, les pixels déjà
+    redimensionnés sont aussi écrits sur disque : au démarrage suivant on évite
+    le décodage PNG/GIF.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._images = {}
+        self._frames = {}
+        self._fonts = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0  # surfaces relues depuis le cache disque
+        self.decodes = 0    # fichiers réellement décodés (PNG, GIF, TTF)
+
+    def resolve(self, path):
+        """Les chemins relatifs sont relatifs à la racine du projet, pas au dossier courant."""
+        return path if os.path.isabs(path) else os.path.join(ROOT, path)
+
+    def image(self, path, size=None, alpha=False):
+        """Renvoie la surface de `path`, redimensionnée à `size` et convertie au format de l'écran."""
+        key = (path, tuple(size) if size else None, alpha)
+        entry = self._images.get(key)
+        if entry is not None:
+            self.hits += 1
+            surface, converted = entry
+            if not converted and pg.display.get_surface() is not None:
+                # La fenêtre n'existait pas au premier chargement : on convertit maintenant
+                surface = self._convert(surface, alpha)
+                self._images[key] = (surface, True)
+            return surface
+
+        self.misses += 1
+        fmt = "RGBA" if alpha else "RGB"
+        cached = self._read_cache(key, fmt)
+        if cached is not None:
+            surface = cached[0]
+        else:
+            surface = pg.image.load(self.resolve(path))
+            self.decodes += 1
+            if key[1]:
+                surface = pg.transform.scale(surface, key[1])
+            self._write_cache(key, [surface], fmt)
+
+        converted = pg.display.get_surface() is not None
+        if converted:
+            surface = self._convert(surface, alpha)
+        self._images[key] = (surface, converted)
+        return surface
+
+    def frames(self, path, size=None):
+        """Renvoie la liste des images d'un GIF animé, redimensionnées à `size`."""
+        key = (path, tuple(size) if size else None, True)
+        frames = self._frames.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+
+        self.misses += 1
+        frames = self._read_cache(key, "RGBA")
+        if frames is None:
+            from PIL import Image, ImageSequence
+            frames = []
+            for frame in ImageSequence.Iterator(Image.open(self.resolve(path))):
+                frame = frame.convert('RGBA')
+                surface = pg.image.fromstring(frame.tobytes(), frame.size, frame.mode)
+                if key[1]:
+                    surface = pg.transform.scale(surface, key[1])
+                frames.append(surface)
+            self.decodes += 1
+            self._write_cache(key, frames, "RGBA")
+
+        if pg.display.get_surface() is not None:
+            frames = [frame.convert_alpha() for frame in frames]
+        self._frames[key] = frames
+        return frames
+
+    def font(self, path, size):
+        """Renvoie la police `path` à la taille `size` (chargée une seule fois)."""
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        if not pg.font.get_init():
+            pg.font.init()
+        font = pg.font.Font(self.resolve(path), size)
+        self.decodes += 1
+        self._fonts[key] = font
+        return font
+
+    def stats(self):
+        """Compteurs du registre ; `io` vaut 0 une fois tous les assets en mémoire."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "decodes": self.decodes,
+            "io": self.disk_hits + self.decodes,
+            "entries": len(self._images) + len(self._frames) + len(self._fonts),
+        }
+
+    def clear(self):
+        self._images.clear()
+        self._frames.clear()
+        self._fonts.clear()
+
+    def _convert(self, surface, alpha):
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _cache_path(self, key):
+        """Fichier du cache disque ; la date de modification du fichier source invalide le cache."""
+        path, size, alpha = key
+        mtime = os.path.getmtime(self.resolve(path))
+        digest = hashlib.sha1(repr((path, size, alpha, mtime)).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".raw")
+
+    def _read_cache(self, key, fmt):
+        if self.cache_dir is None:
+            return None
+        cache_path = self._cache_path(key)
+        if not os.path.exists(cache_path):
+            return None
+
+        # En-tête : nombre d'images, largeur, hauteur ; puis les pixels bruts
+        with open(cache_path, "rb") as f:
+            count, width, height = struct.unpack("<III", f.read(12))
+            frame_size = width * height * len(fmt)
+            surfaces = [pg.image.fromstring(f.read(frame_size), (width, height), fmt) for _ in range(count)]
+        self.disk_hits += 1
+        return surfaces
+
+    def _write_cache(self, key, surfaces, fmt):
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self._cache_path(key)
+        width, height = surfaces[0].get_size()
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(struct.pack("<III", len(surfaces), width, height))
+            for surface in surfaces:
+                f.write(pg.image.tostring(surface, fmt))
+        os.replace(tmp_path, cache_path)
+
+
+# Registre unique pour tout le processus
+registry = AssetRegistry(cache_dir=os.environ.get("ASSET_CACHE_DIR"))
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Les benchmarks tournent sans écran : SDL utilise des pilotes factices
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "pong")):
+    if path not in sys.path:
+        sys.path.append(path)
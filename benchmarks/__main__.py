@@ -0,0 +1,83 @@
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+import pygame as pg
+from benchmarks import pong_obs, simulation, rendering, startup, vision
+
+SUITES = {
+    "pong_env": simulation.pong_env_steps,
+    "pong_obs": pong_obs.run,
+    "breakout": simulation.breakout_ticks,
+    "breakout_env": simulation.breakout_env_steps,
+    "render": rendering.render_fps,
+    "startup": startup.run,
+    "vision": vision.run,
+}
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(results, baseline, tolerance):
+    """Mesures de débit (par seconde, fps) en baisse de plus de `tolerance` par rapport à la référence."""
+    current = flatten(results)
+    regressions = []
+    for name, reference in flatten(baseline["results"]).items():
+        if not (name.endswith("_per_s") or name.endswith("fps")) or name not in current:
+            continue
+        ratio = current[name] / reference
+        if ratio < 1 - tolerance:
+            regressions.append((name, reference, current[name], ratio))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks de simulation et de rendu (sans écran)")
+    parser.add_argument("suites", nargs="*", help=f"suites à lancer parmi {', '.join(SUITES)} (toutes par défaut)")
+    parser.add_argument("--out", help="fichier JSON de résultats (sortie standard sinon)")
+    parser.add_argument("--baseline", help="résultats JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="baisse de débit tolérée (0.1 = 10 %%)")
+    args = parser.parse_args()
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"suites inconnues : {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in args.suites or SUITES:
+        print(f"{name}...", file=sys.stderr)
+        results[name] = SUITES[name]()
+
+    report = {
+        "time": time.time(),
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, reference, value, ratio in regressions:
+            print(f"Régression {name} : {reference:.1f} -> {value:.1f} ({ratio:.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
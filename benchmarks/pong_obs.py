@@ -0,0 +1,28 @@
+import json
+import time
+import numpy as np
+from pong_env import PongEnv
+
+
+def steps_per_second(env, n_steps, seed=0):
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, n_steps)
+    env.reset()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    return n_steps / (time.perf_counter() - start)
+
+
+def run(n_steps=20_000):
+    """Débit de PongEnv.step selon le type d'observation (vecteur ou pixels empilés)."""
+    return {
+        "vector_steps_per_s": steps_per_second(PongEnv(obs_type="vector"), n_steps),
+        "pixels_steps_per_s": steps_per_second(PongEnv(obs_type="pixels"), n_steps),
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
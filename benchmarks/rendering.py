@@ -0,0 +1,57 @@
+import time
+import numpy as np
+
+
+def _render_fps(render, update, n_frames):
+    render()  # premier rendu : chargement des assets
+    elapsed = 0.0
+    for _ in range(n_frames):
+        update()
+        start = time.perf_counter()
+        render()
+        elapsed += time.perf_counter() - start
+    return n_frames / elapsed
+
+
+def pong_env_fps(n_frames=1_000):
+    from pong_env import PongEnv
+    env = PongEnv(render_mode="human", fps=0)
+    rng = np.random.default_rng(0)
+
+    def update():
+        _, _, done, _ = env.step(rng.integers(0, 3))
+        if done:
+            env.reset()
+    return _render_fps(env.render, update, n_frames)
+
+
+def pong_fps(n_frames=1_000):
+    from pong.pong import Pong
+    np.random.seed(0)
+    game = Pong(control="keyboard", fps=0)
+
+    def update():
+        game.update_ball()
+        game.bot_movement()
+    return _render_fps(game.render, update, n_frames)
+
+
+def breakout_fps(n_frames=1_000, rows=3):
+    from benchmarks.simulation import _breakout, _follow_ball
+    game = _breakout(rows)
+
+    def update():
+        _follow_ball(game)
+        game.update_ball()
+        game.check_life()
+    return _render_fps(game.render, update, n_frames)
+
+
+def render_fps(n_frames=1_000):
+    """Images/s de render() pour chaque jeu, sans limite de FPS (pilote vidéo SDL factice)."""
+    return {
+        "pong_env_fps": pong_env_fps(n_frames),
+        "pong_fps": pong_fps(n_frames),
+        "breakout_fps": breakout_fps(n_frames),
+        "breakout_rows_12_fps": breakout_fps(n_frames, rows=12),
+    }
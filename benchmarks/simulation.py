@@ -0,0 +1,79 @@
+import time
+import numpy as np
+from pong_env import PongEnv
+from benchmarks.pong_obs import steps_per_second
+
+BREAKOUT_ROWS = (1, 3, 6, 12, 100, 300)
+
+
+def pong_env_steps(n_steps=50_000):
+    """Débit brut de PongEnv.step (observation vecteur), tick par tick et en saut analytique."""
+    return {
+        "steps_per_s": steps_per_second(PongEnv(), n_steps),
+        "frame_skip4_steps_per_s": steps_per_second(PongEnv(frame_skip=4), n_steps // 4),
+        "analytic_frame_skip4_steps_per_s": steps_per_second(PongEnv(frame_skip=4, analytic=True), n_steps // 4),
+    }
+
+
+def breakout_env_steps(n_steps=20_000, num_envs=256, rows=(3, 12)):
+    """Débit de BreakoutEnv (une partie) et de VecBreakoutEnv (parties/s cumulées), sans fenêtre."""
+    from breakout.breakout_env import BreakoutEnv, VecBreakoutEnv
+    results = {}
+    for n_rows in rows:
+        vec = VecBreakoutEnv(num_envs, rows=n_rows, seed=0)
+        vec.reset()
+        actions = np.random.default_rng(0).integers(0, 3, (n_steps // 10, num_envs))
+        start = time.perf_counter()
+        for action in actions:
+            vec.step(action)
+        vec_rate = len(actions) * num_envs / (time.perf_counter() - start)
+        results[f"rows_{n_rows}"] = {
+            "steps_per_s": steps_per_second(BreakoutEnv(rows=n_rows, seed=0), n_steps),
+            f"vec{num_envs}_steps_per_s": vec_rate,
+        }
+    return results
+
+
+def _breakout(rows):
+    from breakout.breakout import BreakOut
+    np.random.seed(0)
+    # Fenêtre agrandie pour les niveaux qui dépassent l'écran : la raquette reste sous les blocs
+    # et reset_ball place la balle entre les deux
+    game = BreakOut(rows=rows, fps=0, HEIGHT=max(720, 5 + 21 * rows + 300))
+    # Blocs indestructibles : le nombre de blocs reste celui mesuré pendant tout le benchmark
+    for bloc in game.blocs:
+        bloc.life = 10 ** 9
+    return game
+
+
+def _follow_ball(game):
+    game.paddle_player_x = min(max(game.ball_x - game.paddle_width // 2, 0), game.WIDTH - game.paddle_width)
+
+
+def breakout_ticks(rows=BREAKOUT_ROWS, n_ticks=20_000):
+    """Ticks/s de BreakOut.update_ball et de check_collision_with_blocks seul, selon le nombre de blocs."""
+    results = {}
+    for n_rows in rows:
+        game = _breakout(n_rows)
+        n_blocs = len(game.blocs)
+
+        start = time.perf_counter()
+        for _ in range(n_ticks):
+            _follow_ball(game)
+            game.update_ball()
+            game.check_life()
+        update_rate = n_ticks / (time.perf_counter() - start)
+
+        # Détection seule, balle sous les blocs : seules les cases de son trajet sont consultées
+        game.ball_x, game.ball_y = game.WIDTH // 2, game.HEIGHT - 100
+        start = time.perf_counter()
+        for _ in range(n_ticks):
+            game.check_collision_with_blocks()
+        collision_rate = n_ticks / (time.perf_counter() - start)
+
+        results[f"rows_{n_rows}"] = {
+            "blocs": n_blocs,
+            "update_ball_ticks_per_s": update_rate,
+            "collision_ticks_per_s": collision_rate,
+        }
+    return results
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import time
+import subprocess
+from benchmarks import ROOT
+
+HEAVY_MODULES = ("torch", "ultralytics", "mediapipe", "cv2", "pygame_gui")
+
+# Exécuté dans un interpréteur neuf : du début du script au premier affichage du menu
+FIRST_FRAME = """
+import time
+start = time.perf_counter()
+import sys, json, pygame
+import menu
+m = menu.Menu()
+m.draw(0.0)
+elapsed = time.perf_counter() - start
+print(json.dumps({"first_frame_s": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _run(args):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    return subprocess.run([sys.executable] + args, cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def import_times(module, top=15):
+    """Rapport de `python -X importtime -c "import module"` : total et modules les plus coûteux (ms)."""
+    proc = _run(["-X", "importtime", "-c", f"import {module}"])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        return {"error": errors[-1] if errors else "échec de l'import"}
+    total = next(cumulative for name, _, cumulative in rows if name == module)
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return {
+        "total_ms": total,
+        "modules": len(rows),
+        "top_self_ms": {name: self_ms for name, self_ms, _ in rows[:top]},
+    }
+
+
+def first_frame():
+    """Temps jusqu'au premier affichage du menu, interpréteur compris, et modules lourds déjà chargés."""
+    start = time.perf_counter()
+    proc = _run(["-c", FIRST_FRAME])
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_s"] = wall
+    return result
+
+
+def run():
+    return {
+        "import_menu": import_times("menu"),
+        "import_pong": import_times("pong.pong"),
+        "import_breakout": import_times("breakout.breakout"),
+        "menu_first_frame": first_frame(),
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
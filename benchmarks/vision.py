@@ -0,0 +1,104 @@
+import os
+import json
+import time
+import argparse
+import cv2
+from pong.telemetry import Telemetry
+from vision.frame_source import SyntheticSource, open_source
+from vision.tracking import DetectionScheduler
+from vision import controls
+
+CLIP_FRAMES = 300
+DETECT_EVERY = 3
+
+
+def clip_source(clip=None, n_frames=CLIP_FRAMES):
+    """Clip fixe : le fichier/dossier donné (lu une fois, sans boucle), sinon une séquence synthétique graine 0."""
+    if clip is None:
+        return SyntheticSource(fps=0, n_frames=n_frames, n_shapes=2, seed=0)
+    source = open_source(clip)
+    source.loop = False
+    return source
+
+
+def _mediapipe_hands():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
+
+
+def _yolo():
+    from ultralytics import YOLO
+    return YOLO("yolo11n.pt")
+
+
+# Nom -> (construction du détecteur, prétraitement de l'image avant détection)
+PIPELINES = {
+    "blob": (lambda: controls.bright_blob_detector(), None),
+    "pong_yolo_roi": (lambda: controls.yolo_detector(_yolo(), ("bottle", "cell phone"), roi=True), None),
+    "pong_yolo_full": (lambda: controls.yolo_detector(_yolo(), ("bottle", "cell phone"), roi=False), None),
+    "breakout_wrist": (lambda: controls.wrist_detector(_mediapipe_hands()), None),
+    "motus_fingers": (lambda: controls.fingers_detector(_mediapipe_hands()), lambda frame: cv2.flip(frame, 1)),
+}
+
+
+def replay(source, detect, preprocess=None, every=DETECT_EVERY):
+    """Fait passer toutes les images de `source` dans le pipeline ; FPS et latences par étape (ms)."""
+    telemetry = Telemetry()
+
+    def timed_detect(frame):
+        with telemetry.timer("detect"):
+            return detect(frame)
+
+    scheduler = DetectionScheduler(timed_detect, every=every)
+    frames = 0
+    start = time.perf_counter()
+    while True:
+        with telemetry.timer("capture"):
+            ret, frame = source.read()
+        if not ret:
+            break
+        with telemetry.timer("total"):
+            if preprocess is not None:
+                with telemetry.timer("preprocess"):
+                    frame = preprocess(frame)
+            with telemetry.timer("schedule"):
+                scheduler(frame)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    source.release()
+
+    summary = telemetry.summary()
+    result = {"frames": frames, "fps": frames / elapsed}
+    for stage in ("capture", "preprocess", "detect", "schedule", "total"):
+        for key in ("p50", "p95", "mean"):
+            name = f"{stage}_{key}_ms"
+            if name in summary:
+                result[name] = summary[name]
+    # Le suivi n'est chronométré que par le planificateur (flux optique seul, hors prétraitement)
+    stats = scheduler.stats()
+    result["track_mean_ms"] = stats["track_ms"]
+    result["scheduler"] = stats
+    return result
+
+
+def run(clip=None, pipelines=None):
+    """Rejoue le même clip dans chaque pipeline ; les pipelines dont les dépendances manquent sont signalés."""
+    clip = clip if clip is not None else os.environ.get("VISION_CLIP")
+    results = {}
+    for name in pipelines or PIPELINES:
+        build, preprocess = PIPELINES[name]
+        try:
+            detect = build()
+        except ImportError as e:
+            results[name] = {"error": str(e)}
+            continue
+        results[name] = replay(clip_source(clip), detect, preprocess)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rejoue un clip fixe dans les pipelines de vision")
+    parser.add_argument("--clip", default=None, help="fichier vidéo ou dossier d'images (synthétique sinon)")
+    parser.add_argument("pipelines", nargs="*", help=f"parmi {', '.join(PIPELINES)} (tous par défaut)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.clip, args.pipelines), indent=2))
@@ -3,18 +3,32 @@ import numpy as np
 import sys
 from collections import deque
 import threading
-import cv2
-import mediapipe as mp
+import time
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asset_registry import registry
+from vision.latency import LatencyTracer
 
 BLOC_WIDTH = 61
 BLOC_HEIGHT = 20 
+# Disposition des blocs : coin du premier bloc et pas entre deux blocs (une case de la grille par bloc)
+BLOC_X0 = 15
+BLOC_Y0 = 5
+BLOC_PITCH_X = 64
+BLOC_PITCH_Y = 21
+DETECT_EVERY = 3  # MediaPipe une image sur DETECT_EVERY, flux optique entre les deux
 
 class BreakOut:
-    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, rows = 3, ball_speed = 7, control:str="keyboard"):
+    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, rows = 3, ball_speed = 7, control:str="keyboard", fps:int=60, camera_source=None,
+                 trace=None):
         pg.init()
         self.clock = pg.time.Clock()
         self.WIDTH = WIDTH
         self.HEIGHT = HEIGHT
+        self.fps = fps  # 0 = sans limite d'images par seconde
+        # Latence capture -> affichage : F3 affiche le HUD, traces écrites en CSV dans `trace` à la fermeture
+        self.tracer = LatencyTracer(path=trace)
 
         self.ball_radius = 6
         self.paddle_width = 180
@@ -30,6 +44,8 @@ class BreakOut:
 
         self.screen = pg.display.set_mode((self.WIDTH, self.HEIGHT))
         self.control_type = control
+        # None : flux partagé du service caméra, sinon YOLO_CAMERA ; ou toute source de vision.frame_source
+        self.camera_source = camera_source
 
         self.score_player = 0
         self.life = 3
@@ -37,12 +53,17 @@ class BreakOut:
         # 80 Correspond to the bloc width
         self.nb_columns = self.WIDTH // BLOC_WIDTH -1
 
+        # Rendu par zones : fond et blocs sont précalculés dans self.static, seules les zones
+        # touchées par les sprites (sprite_rects) et les blocs modifiés (dirty_rects) sont redessinées
         self.dirty_rects = []
+        self.sprite_rects = []
         self.background = None
+        self.static = None
         self.need_redraw = True
 
         # Définition des actions : 0 = rien, 1 = haut et 2 = bas
         self.hand_translation = "immobile"
+        self.hand_stamp = None  # (n° d'image, capture, fin de détection) de la dernière hand_translation
         self.hand_positions = deque(maxlen=10)
         self.hand_thread = None
         self.running = True
@@ -52,37 +73,42 @@ class BreakOut:
 
     def load_assets(self):
         """Pré-calculer toutes les transformations d'images"""
-        self.background_asset = pg.image.load("breakout/BasicBreakoutAssetPack/background.png").convert()
-        self.background = pg.transform.scale(self.background_asset, (self.WIDTH, self.HEIGHT))
-        
-        self.ball_img = pg.image.load("breakout/BasicBreakoutAssetPack/ball.png").convert_alpha()
-        self.ball_img = pg.transform.scale(self.ball_img, (self.ball_radius*2, self.ball_radius*2))
-        
-        self.paddle = pg.image.load("breakout/BasicBreakoutAssetPack/paddle.png").convert_alpha()
-        self.paddle = pg.transform.scale(self.paddle, (self.paddle_width, self.paddle_height))
+        self.background = registry.image("breakout/BasicBreakoutAssetPack/background.png", (self.WIDTH, self.HEIGHT))
+        self.ball_img = registry.image("breakout/BasicBreakoutAssetPack/ball.png", (self.ball_radius*2, self.ball_radius*2), alpha=True)
+        self.paddle = registry.image("breakout/BasicBreakoutAssetPack/paddle.png", (self.paddle_width, self.paddle_height), alpha=True)
         
-        # Charger le spritesheet une seule fois
-        self.block_spritesheet = pg.image.load("breakout/BasicBreakOutAssetPack/blocks.png").convert_alpha()
+        # Charger le spritesheet une seule fois, découpé et redimensionné pour tous les blocs
+        self.block_spritesheet = registry.image("breakout/BasicBreakoutAssetPack/blocks.png", alpha=True)
+        self.block_atlas = BlockAtlas(self.block_spritesheet)
 
 
     def start_hand_tracking(self):
         """Démarrer le tracking de main dans un thread séparé"""
+        # Imports lourds seulement quand le contrôle à la main est utilisé
+        import mediapipe as mp
+        from vision.controls import wrist_detector
+        from vision.tracking import DetectionScheduler
+        from vision.camera_service import open_camera
         mp_hands = mp.solutions.hands
         mp_drawing = mp.solutions.drawing_utils
         def hand_tracking_loop():
-            cap = cv2.VideoCapture(1)
+            cap = open_camera(self.camera_source)
             hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.7)
+
+            self.hand_scheduler = DetectionScheduler(wrist_detector(hands), every=DETECT_EVERY)
             
+            seq = 0
             while self.running:
                 ret, frame = cap.read()
                 if not ret:
                     continue
+                captured_at = time.perf_counter()
+                seq += 1
                 
-                results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                track = self.hand_scheduler(frame)
                 
-                if results.multi_hand_landmarks:
-                    hand_landmarks = results.multi_hand_landmarks[0]
-                    wrist_x = hand_landmarks.landmark[mp_hands.HandLandmark.WRIST].x * frame.shape[1]
+                if track.points is not None:
+                    wrist_x = track.points[0][0]
                     self.hand_positions.append(wrist_x)
                     
                     if len(self.hand_positions) > 1:
@@ -93,7 +119,9 @@ class BreakOut:
                             self.hand_translation = "left"
                         else:
                             self.hand_translation = "immobile"
+                        self.hand_stamp = (seq, captured_at, time.perf_counter())
             cap.release()
+            print(self.hand_scheduler.format_stats())
 
         self.hand_thread = threading.Thread(target=hand_tracking_loop)
         self.hand_thread.start()
@@ -110,6 +138,9 @@ class BreakOut:
 
     def control_hand(self):
         """Modifier la méthode de contrôle pour utiliser le tracking de main"""
+        stamp = self.hand_stamp
+        if stamp is not None:
+            self.tracer.control(*stamp)
         if self.hand_translation == "right":
             if self.paddle_player_x < self.WIDTH - self.paddle_width:
                 self.paddle_player_x += self.paddle_speed
@@ -122,6 +153,10 @@ class BreakOut:
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 self.close()
+            if event.type == pg.KEYDOWN and event.key == pg.K_F3:
+                self.tracer.toggle_hud()
+            if event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                self.need_redraw = True
 
     def update_score(self):
         if self.life < 1:
@@ -136,26 +171,42 @@ class BreakOut:
         
     def reset_ball(self):
         self.ball_x = self.WIDTH // 2
-        self.ball_y = self.HEIGHT // 2 - 10
+        # Sous le champ de blocs s'il descend plus bas que le milieu de l'écran
+        self.ball_y = max(self.HEIGHT // 2 - 10, BLOC_Y0 + self.nb_rows * BLOC_PITCH_Y + 2 * self.ball_radius)
         self.ball_dx = np.random.choice([-self.ball_speed, self.ball_speed])
         self.ball_dy = np.random.choice([-self.ball_speed, self.ball_speed])
 
     def create_blocs(self):
-        pos_x = 5
-        pos_y = 5
-        self.bloc_list = []
-        for i in range(0, self.nb_columns*self.nb_rows, 1):
-            reste = i // self.nb_columns
-            pos_y = 5 + (reste * 21)
-            if i % self.nb_columns == 0:
-                pos_x = 15
-            #print(f"pos_x: {pos_x}/tpos_y: {pos_y}")
-            self.bloc_list.append(Bloc(pos_x=pos_x, pos_y=pos_y, life=2))
-            pos_x += 64
-
-    def draw_blocs(self):
-        for bloc in self.bloc_list:
-            bloc.draw_bloc(self.screen)
+        self.blocs = BlockGrid()
+        for row in range(self.nb_rows):
+            for col in range(self.nb_columns):
+                self.blocs.add(Bloc(pos_x=BLOC_X0 + col * BLOC_PITCH_X, pos_y=BLOC_Y0 + row * BLOC_PITCH_Y,
+                                    life=2, atlas=self.block_atlas))
+        self.need_redraw = True
+
+    def draw_blocs(self, surface):
+        """Dessine tous les blocs en un seul appel à blits."""
+        sprite = self.block_atlas.sprite
+        surface.blits([(sprite(bloc.life), (bloc.pos_x, bloc.pos_y)) for bloc in self.blocs], doreturn=False)
+
+    def bake(self):
+        """Recalcule la couche statique (fond + blocs restants) et la recopie sur tout l'écran."""
+        self.static = self.background.copy()
+        self.draw_blocs(self.static)
+        self.screen.blit(self.static, (0, 0))
+        self.dirty_rects = []
+        self.sprite_rects = []
+        self.need_redraw = False
+
+    def bake_bloc(self, bloc):
+        """Met à jour la case d'un bloc touché ou détruit dans la couche statique."""
+        if self.static is None:
+            return
+        rect = pg.Rect(bloc.pos_x, bloc.pos_y, bloc.width, bloc.height)
+        self.static.blit(self.background, rect, rect)
+        if bloc.life > 0:
+            self.static.blit(self.block_atlas.sprite(bloc.life), rect)
+        self.dirty_rects.append(rect)
         
     def update_ball(self):
 
@@ -174,10 +225,9 @@ class BreakOut:
         ) :
             self.ball_dy = -self.ball_dy  # Inverser la direction
 
-        self.check_collision_with_blocks()
-
-        self.ball_x += self.ball_dx
-        self.ball_y += self.ball_dy
+        if not self.check_collision_with_blocks():
+            self.ball_x += self.ball_dx
+            self.ball_y += self.ball_dy
 
     def reset(self):
         self.reset_ball()
@@ -187,43 +237,69 @@ class BreakOut:
         self.create_blocs()
     
     def check_collision_with_blocks(self):
-        for bloc in self.bloc_list:
-            if (
-                self.ball_x + self.ball_radius >= bloc.pos_x and
-                self.ball_x - self.ball_radius <= bloc.pos_x + bloc.width and
-                self.ball_y + self.ball_radius >= bloc.pos_y and
-                self.ball_y - self.ball_radius <= bloc.pos_y + bloc.height
-            ):
-                bloc.life -= 1
-                #print(bloc)
-                if bloc.life <= 0:
-                    self.bloc_list.remove(bloc)  # Supprime le bloc s'il n'a plus de vie
-                
-                # Inverser la direction de la balle
-                self.ball_dy = -self.ball_dy
-                break  # Pour éviter de traiter plusieurs collisions en une frame
+        """Collision continue de la balle avec les blocs pendant le déplacement de ce tick.
+
+        Seules les cases traversées par la balle (boîte de son trajet élargie du rayon) sont
+        testées. Au premier contact la balle est placée au point de contact et rebondit selon
+        la face touchée ; renvoie True si elle a été déplacée.
+        """
+        x, y, dx, dy, radius = self.ball_x, self.ball_y, self.ball_dx, self.ball_dy, self.ball_radius
+        hit = None
+        for bloc in self.blocs.query(min(x, x + dx) - radius, min(y, y + dy) - radius,
+                                     max(x, x + dx) + radius, max(y, y + dy) + radius):
+            contact = sweep(x, y, dx, dy, radius, bloc)
+            if contact is not None and (hit is None or contact[0] < hit[0]):
+                hit = contact + (bloc,)
+        if hit is None:
+            return False
+
+        t, axis, bloc = hit
+        bloc.life -= 1
+        if bloc.life <= 0:
+            self.blocs.remove(bloc)  # Supprime le bloc s'il n'a plus de vie
+        self.bake_bloc(bloc)
+
+        self.ball_x = x + dx * t
+        self.ball_y = y + dy * t
+        # Rebond : la vitesse repart du côté de la face touchée
+        if axis == 0:
+            self.ball_dx = -abs(dx) if self.ball_x < bloc.pos_x + bloc.width / 2 else abs(dx)
+        else:
+            self.ball_dy = -abs(dy) if self.ball_y < bloc.pos_y + bloc.height / 2 else abs(dy)
+        return True
 
     def render(self):
-        # Efface complètement l'écran avant de dessiner
-        self.screen.blit(self.background, (0, 0))
+        full = self.need_redraw
+        if full:
+            self.bake()
 
-        # Dessiner les éléments dynamiques
-        self.screen.blit(self.paddle, (self.paddle_player_x, self.paddle_player_y))
-        self.screen.blit(self.ball_img, (self.ball_x - 7, self.ball_y - 7))
+        # Efface les sprites de l'image précédente et recopie les blocs modifiés depuis la couche statique
+        restored = self.sprite_rects + self.dirty_rects
+        self.screen.blits([(self.static, rect, rect) for rect in restored], doreturn=False)
 
-        # Dessiner les blocs
-        for bloc in self.bloc_list:
-            bloc.draw_bloc(self.screen)
+        # Dessiner les éléments dynamiques
+        self.sprite_rects = [
+            self.screen.blit(self.paddle, (self.paddle_player_x, self.paddle_player_y)),
+            self.screen.blit(self.ball_img, (self.ball_x - 7, self.ball_y - 7)),
+        ]
+        hud = self.tracer.draw_hud(self.screen)
+        if hud is not None:
+            self.sprite_rects.append(hud)
+        self.dirty_rects = []
 
-        pg.display.flip()  # Met à jour tout l'écran pour éviter les artefacts
-        self.clock.tick(60)
+        if full:
+            pg.display.flip()
+        else:
+            pg.display.update(restored + self.sprite_rects)
+        self.tracer.presented()
+        self.clock.tick(self.fps)
 
 
     def run(self):
-        self.start_hand_tracking()
+        if self.control_type == "hands":
+            self.start_hand_tracking()
         try:
             while True:
-                start_time = pg.time.get_ticks()
                 self.check_event()
                 if self.control_type == "hands":
                     self.control_hand()
@@ -233,7 +309,6 @@ class BreakOut:
                 self.check_life()
                 self.update_score()
                 self.render()
-                print(f"Frame time: {pg.time.get_ticks() - start_time}ms")
         finally:
             self.running = False
             if self.hand_thread:
@@ -241,39 +316,120 @@ class BreakOut:
     
     def close(self):
         """Ferme la fenêtre."""
+        path = self.tracer.dump()
+        if path is not None:
+            print(f"Traces de latence écrites dans {path}")
         pg.quit()
         sys.exit()
 
+def sweep(x, y, dx, dy, radius, bloc):
+    """Premier contact de la balle (x, y) qui se déplace de (dx, dy) avec le bloc.
+
+    La balle est réduite à son centre et le bloc élargi du rayon (test des dalles).
+    Renvoie (t, axe) avec t dans [0, 1] la fraction du déplacement au contact et axe 0
+    pour une face verticale (rebond en x), 1 pour une face horizontale ; None sans contact.
+    Une balle qui chevauche déjà le bloc au début du tick (t_enter < 0) ne le touche pas :
+    elle le traverse au lieu de rester bloquée au point de contact et de le toucher à chaque tick.
+    """
+    t_enter, t_exit, axis = -float("inf"), 1.0, None
+    for a, p, d, lo, hi in ((0, x, dx, bloc.pos_x, bloc.pos_x + bloc.width),
+                            (1, y, dy, bloc.pos_y, bloc.pos_y + bloc.height)):
+        lo, hi = lo - radius, hi + radius
+        if d == 0:
+            if p < lo or p > hi:
+                return None
+            continue
+        t1, t2 = (lo - p) / d, (hi - p) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter, axis = t1, a
+        t_exit = min(t_exit, t2)
+    # Tolérance : la balle posée sur une face par le contact précédent n'est pas « dans » le bloc
+    if axis is None or t_enter < -1e-9 or t_enter > t_exit or t_enter > 1 or t_exit <= 1e-9:
+        return None
+    return max(t_enter, 0.0), axis
+
+
+class BlockGrid:
+    """Blocs rangés sur une grille uniforme calée sur leur disposition, un bloc par case.
+
+    Ajout, suppression et recherche se font en O(1) ; query ne parcourt que les cases
+    couvertes par la boîte demandée, quel que soit le nombre total de blocs.
+    """
+
+    def __init__(self, origin=(BLOC_X0, BLOC_Y0), pitch=(BLOC_PITCH_X, BLOC_PITCH_Y)):
+        self.x0, self.y0 = origin
+        self.pitch_x, self.pitch_y = pitch
+        self.cells = {}  # (ligne, colonne) -> Bloc
+
+    def cell(self, x, y):
+        return int((y - self.y0) // self.pitch_y), int((x - self.x0) // self.pitch_x)
+
+    def add(self, bloc):
+        self.cells[self.cell(bloc.pos_x, bloc.pos_y)] = bloc
+
+    def remove(self, bloc):
+        del self.cells[self.cell(bloc.pos_x, bloc.pos_y)]
+
+    def query(self, x1, y1, x2, y2):
+        """Blocs des cases qui recoupent la boîte (x1, y1, x2, y2)."""
+        row1, col1 = self.cell(x1, y1)
+        row2, col2 = self.cell(x2, y2)
+        cells = self.cells
+        return [cells[row, col] for row in range(row1, row2 + 1) for col in range(col1, col2 + 1)
+                if (row, col) in cells]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells.values())
+
+
+class BlockAtlas:
+    """Sprites des blocs, un par état de vie, découpés et redimensionnés une seule fois.
+
+    Partagé par tous les blocs : dessiner un bloc n'est plus qu'un blit, sans transform.scale.
+    Une vie hors de l'atlas utilise le sprite 0, comme avant.
+    """
+
+    def __init__(self, spritesheet=None, size=(BLOC_WIDTH, BLOC_HEIGHT), states=8):
+        if spritesheet is None:
+            spritesheet = registry.image("breakout/BasicBreakoutAssetPack/blocks.png", alpha=True)
+        sprite_width = spritesheet.get_width() // states
+        sprite_height = spritesheet.get_height()
+        self.sprites = [
+            pg.transform.scale(spritesheet.subsurface(pg.Rect(i * sprite_width, 0, sprite_width, sprite_height)), size)
+            for i in range(states)
+        ]
+
+    def sprite(self, life):
+        return self.sprites[life] if 0 <= life < len(self.sprites) else self.sprites[0]
+
+
+_default_atlas = None
+
+
+def default_atlas():
+    """Atlas partagé des blocs créés sans atlas explicite."""
+    global _default_atlas
+    if _default_atlas is None:
+        _default_atlas = BlockAtlas()
+    return _default_atlas
+
+
 class Bloc:
-    def __init__(self, pos_x, pos_y, life=4, spritesheet=None):
+    def __init__(self, pos_x, pos_y, life=4, atlas=None):
         self.width = BLOC_WIDTH
         self.height = BLOC_HEIGHT
         self.life = life
         self.pos_x = pos_x
         self.pos_y = pos_y
-        self.spritesheet = spritesheet
-        self.load_assets()
-    
-    def load_assets(self):
-        """Charger une seule fois le spritesheet pour toutes les instances"""
-        if self.spritesheet is None:
-            self.spritesheet = pg.image.load("breakout/BasicBreakOutAssetPack/blocks.png").convert_alpha()
-        
-        self.bloc_asset_list = {}
-        sprite_width = self.spritesheet.get_width() // 8
-        sprite_height = self.spritesheet.get_height()
-        
-        # Découper le spritesheet en sous-surfaces
-        for i in range(8):
-            rect = pg.Rect(i * sprite_width, 0, sprite_width, sprite_height)
-            self.bloc_asset_list[i] = self.spritesheet.subsurface(rect)
+        self.atlas = atlas if atlas is not None else default_atlas()
 
     def draw_bloc(self, screen):
-        sprite = self.bloc_asset_list.get(self.life, self.bloc_asset_list[0])
-        scaled_sprite = pg.transform.scale(sprite, (self.width, self.height))
-        rect = scaled_sprite.get_rect(topleft=(self.pos_x, self.pos_y))
-        screen.blit(scaled_sprite, rect)
-        return rect
+        return screen.blit(self.atlas.sprite(self.life), (self.pos_x, self.pos_y))
 
     def __repr__(self):
         return f"x: {self.pos_x}\ty: {self.pos_y}\tlife: {self.life}"
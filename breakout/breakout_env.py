@@ -0,0 +1,353 @@
+import math
+import numpy as np
+import gym
+from gym import spaces
+
+
+def _slab(p, d, lo, hi):
+    """Version scalaire de la dalle de VecBreakoutEnv._sweep : intervalle des t où p + t*d est dans [lo, hi]."""
+    if d == 0:
+        return (-math.inf, math.inf) if lo <= p <= hi else (math.inf, -math.inf)
+    t1, t2 = (lo - p) / d, (hi - p) / d
+    return (t1, t2) if t1 <= t2 else (t2, t1)
+
+
+class VecBreakoutEnv:
+    """BreakOut sans fenêtre : N parties simulées en parallèle dans des tableaux NumPy.
+
+    Le champ de blocs est une structure de tableaux : positions communes à toutes les
+    parties (block_x, block_y) et vies par partie (life, N x blocs). Les règles sont
+    celles de BreakOut (murs, raquette, blocs à 2 vies, 3 vies pour le joueur) ; la
+    collision balle/blocs est continue comme dans BreakOut.check_collision_with_blocks,
+    mais ne teste que les blocs des cases voisines de la balle, pour toutes les parties à la fois.
+    Seule différence voulue : la raquette renvoie toujours la balle vers le haut (dy = -|dy|),
+    là où BreakOut inverse dy et peut laisser la balle coincée dans la raquette.
+
+    Actions : 0 = rien, 1 = gauche, 2 = droite. Récompense : +1 par bloc touché, -1 par vie perdue.
+    Une partie se termine quand le joueur n'a plus de vie ou qu'il n'y a plus de bloc ;
+    elle est alors relancée automatiquement et l'observation finale est dans
+    info["terminal_observation"].
+    """
+
+    def __init__(self, num_envs: int = 64, WIDTH: int = 1280, HEIGHT: int = 720, rows: int = 3,
+                 ball_speed: int = 7, lives: int = 3, seed=None):
+        self.num_envs = num_envs
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
+
+        # Mêmes dimensions que BreakOut
+        self.ball_radius = 6
+        self.ball_speed = ball_speed
+        self.paddle_width = 180
+        self.paddle_height = 18
+        self.paddle_speed = 10
+        self.paddle_y = HEIGHT - 30
+        self.max_lives = lives
+
+        # Disposition des blocs de BreakOut.create_blocs (breakout.BLOC_*)
+        self.bloc_width, self.bloc_height = 61, 20
+        self.x0, self.y0 = 15, 5
+        self.pitch_x, self.pitch_y = 64, 21
+        self.nb_rows = rows
+        self.nb_columns = WIDTH // self.bloc_width - 1
+        self.bloc_life = 2
+        row, col = np.divmod(np.arange(rows * self.nb_columns), self.nb_columns)
+        self.block_x = (self.x0 + col * self.pitch_x).astype(np.float64)
+        self.block_y = (self.y0 + row * self.pitch_y).astype(np.float64)
+        self.n_blocks = len(self.block_x)
+
+        # Cases voisines à tester : décalages (ligne, colonne) autour de la case de la balle,
+        # assez larges pour couvrir le trajet d'un tick élargi du rayon
+        reach = ball_speed + self.ball_radius
+        dr = np.arange(-math.floor((reach + self.bloc_height) / self.pitch_y), math.ceil(reach / self.pitch_y) + 1)
+        dc = np.arange(-math.floor((reach + self.bloc_width) / self.pitch_x), math.ceil(reach / self.pitch_x) + 1)
+        self.near_rows, self.near_cols = (a.reshape(-1) for a in np.meshgrid(dr, dc, indexing="ij"))
+        self._near = list(zip(self.near_rows.tolist(), self.near_cols.tolist()))
+
+        self.action_space = spaces.Discrete(3)
+        # Balle (x, y, dx, dy), raquette x et vies normalisées, puis la vie de chaque bloc dans [0, 1]
+        self.observation_space = spaces.Box(low=-1, high=1, shape=(6 + self.n_blocks,), dtype=np.float32)
+
+        self.rng = np.random.default_rng(seed)
+
+        # État de toutes les parties, un élément (ou une ligne) par environnement
+        self.ball_x = np.zeros(num_envs, dtype=np.float64)
+        self.ball_y = np.zeros(num_envs, dtype=np.float64)
+        self.ball_dx = np.zeros(num_envs, dtype=np.float64)
+        self.ball_dy = np.zeros(num_envs, dtype=np.float64)
+        self.paddle_x = np.zeros(num_envs, dtype=np.int32)
+        self.lives = np.zeros(num_envs, dtype=np.int32)
+        self.life = np.zeros((num_envs, self.n_blocks), dtype=np.int16)
+        self.blocks_left = np.zeros(num_envs, dtype=np.int32)
+        self.env_index = np.arange(num_envs)
+        self._first = self.env_index == 0
+
+        self._obs = np.empty((num_envs, 6 + self.n_blocks), dtype=np.float32)
+        self._scale = np.array([1 / WIDTH, 1 / HEIGHT, 1 / ball_speed, 1 / ball_speed, 1 / WIDTH, 1 / lives],
+                               dtype=np.float32)
+
+    def _reset_balls(self, mask):
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return
+        self.ball_x[mask] = self.WIDTH // 2
+        # Sous le champ de blocs s'il descend plus bas que le milieu de l'écran (comme BreakOut.reset_ball)
+        self.ball_y[mask] = max(self.HEIGHT // 2 - 10, self.y0 + self.nb_rows * self.pitch_y + 2 * self.ball_radius)
+        self.ball_dx[mask] = self.rng.choice([-self.ball_speed, self.ball_speed], size=n)
+        self.ball_dy[mask] = self.rng.choice([-self.ball_speed, self.ball_speed], size=n)
+
+    def _reset_envs(self, mask):
+        """Remet à zéro les parties sélectionnées par le masque."""
+        self._reset_balls(mask)
+        self.paddle_x[mask] = self.WIDTH // 2
+        self.lives[mask] = self.max_lives
+        self.life[mask] = self.bloc_life
+        self.blocks_left[mask] = self.n_blocks
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._get_obs()
+
+    def _get_obs(self):
+        obs = self._obs
+        obs[:, 0] = self.ball_x
+        obs[:, 1] = self.ball_y
+        obs[:, 2] = self.ball_dx
+        obs[:, 3] = self.ball_dy
+        obs[:, 4] = self.paddle_x
+        obs[:, 5] = self.lives
+        obs[:, :6] *= self._scale
+        np.multiply(self.life, 1 / self.bloc_life, out=obs[:, 6:])
+        return obs.copy()
+
+    def _sweep(self):
+        """Premier bloc touché par chaque balle pendant ce tick (test des dalles vectorisé).
+
+        Renvoie (hit, t, axis, block) : masque des parties avec contact, fraction du
+        déplacement au contact, axe de la face touchée (0 : rebond en x, 1 : en y) et indice du bloc.
+        """
+        r = self.ball_radius
+        x, y, dx, dy = (a[:, None] for a in (self.ball_x, self.ball_y, self.ball_dx, self.ball_dy))
+
+        # Blocs candidats : cases voisines de celle de la balle, (N, K)
+        rows = np.floor((self.ball_y - self.y0) / self.pitch_y).astype(np.int64)[:, None] + self.near_rows
+        cols = np.floor((self.ball_x - self.x0) / self.pitch_x).astype(np.int64)[:, None] + self.near_cols
+        valid = (rows >= 0) & (rows < self.nb_rows) & (cols >= 0) & (cols < self.nb_columns)
+        block = np.clip(rows, 0, self.nb_rows - 1) * self.nb_columns + np.clip(cols, 0, self.nb_columns - 1)
+        valid &= self.life[self.env_index[:, None], block] > 0
+
+        def slab(p, d, lo, hi):
+            # Intervalle des t où la coordonnée est dans [lo, hi] ; vitesse nulle : tout ou rien
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t1, t2 = (lo - p) / d, (hi - p) / d
+            inside = (lo <= p) & (p <= hi)
+            still = d == 0
+            t_min = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+            t_max = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+            return t_min, t_max
+
+        bx, by = self.block_x[block], self.block_y[block]
+        tx_min, tx_max = slab(x, dx, bx - r, bx + self.bloc_width + r)
+        ty_min, ty_max = slab(y, dy, by - r, by + self.bloc_height + r)
+        t_enter = np.maximum(tx_min, ty_min)
+        t_exit = np.minimum(np.minimum(tx_max, ty_max), 1.0)
+        # Comme breakout.sweep : pas de contact avec un bloc que la balle chevauche déjà
+        contact = valid & (t_enter >= -1e-9) & (t_enter <= t_exit) & (t_enter <= 1) & (t_exit > 1e-9)
+
+        t = np.where(contact, np.maximum(t_enter, 0.0), np.inf)
+        k = np.argmin(t, axis=1)
+        t = t[self.env_index, k]
+        hit = np.isfinite(t)
+        axis = (ty_min > tx_min)[self.env_index, k].astype(np.int8)
+        return hit, np.where(hit, t, 1.0), axis, block[self.env_index, k]
+
+    def step(self, actions):
+        """Exécute une action par environnement et renvoie (obs, rewards, dones, info)."""
+        actions = np.asarray(actions)
+        r = self.ball_radius
+
+        # Raquette
+        right = (actions == 2) & (self.paddle_x < self.WIDTH - self.paddle_width)
+        left = (actions == 1) & (self.paddle_x > 0)
+        self.paddle_x += self.paddle_speed * right
+        self.paddle_x -= self.paddle_speed * left
+
+        # Rebond sur le haut et les côtés
+        np.negative(self.ball_dy, out=self.ball_dy, where=self.ball_y - r <= 0)
+        side = (self.ball_x - r < 0) | (self.ball_x + r >= self.WIDTH)
+        np.negative(self.ball_dx, out=self.ball_dx, where=side)
+
+        # Rebond sur la raquette, toujours vers le haut
+        ball_left = self.ball_x - r
+        hit_paddle = ((self.paddle_x <= ball_left) & (ball_left <= self.paddle_x + self.paddle_width)
+                      & (self.paddle_y <= self.ball_y) & (self.ball_y <= self.paddle_y + self.paddle_height))
+        self.ball_dy[hit_paddle] = -np.abs(self.ball_dy[hit_paddle])
+
+        # Blocs : la balle avance jusqu'au premier contact puis rebondit selon la face touchée
+        hit, t, axis, block = self._sweep()
+        self.ball_x += self.ball_dx * t
+        self.ball_y += self.ball_dy * t
+        envs, block = self.env_index[hit], block[hit]
+        on_x = axis[hit] == 0
+        center_x = self.block_x[block] + self.bloc_width / 2
+        center_y = self.block_y[block] + self.bloc_height / 2
+        speed_x, speed_y = np.abs(self.ball_dx[envs]), np.abs(self.ball_dy[envs])
+        self.ball_dx[envs] = np.where(on_x, np.where(self.ball_x[envs] < center_x, -speed_x, speed_x), self.ball_dx[envs])
+        self.ball_dy[envs] = np.where(on_x, self.ball_dy[envs], np.where(self.ball_y[envs] < center_y, -speed_y, speed_y))
+        self.life[envs, block] -= 1
+        self.blocks_left[envs] -= self.life[envs, block] == 0
+
+        # Balle perdue en bas de l'écran
+        lost = self.ball_y + r > self.HEIGHT
+        self.lives -= lost
+        self._reset_balls(lost)
+
+        rewards = hit.astype(np.float32) - lost
+        dones = (self.lives <= 0) | (self.blocks_left == 0)
+
+        info = {"hit": hit, "lost": lost, "blocks_left": self.blocks_left.copy()}
+        if dones.any():
+            info["terminal_observation"] = self._get_obs()[dones]
+            self._reset_envs(dones)
+
+        return self._get_obs(), rewards, dones, info
+
+    def _step_single(self, action):
+        """step() de la partie 0 en arithmétique Python scalaire, pour num_envs == 1.
+
+        Mêmes règles, mêmes calculs flottants et mêmes tirages aléatoires que step() ;
+        évite le coût fixe des opérations NumPy sur des tableaux d'un élément.
+        Renvoie (obs, reward, done, info, terminal_obs), terminal_obs valant None si la partie continue.
+        """
+        r = self.ball_radius
+        x, y = float(self.ball_x[0]), float(self.ball_y[0])
+        dx, dy = float(self.ball_dx[0]), float(self.ball_dy[0])
+        paddle_x = int(self.paddle_x[0])
+
+        # Raquette
+        if action == 2 and paddle_x < self.WIDTH - self.paddle_width:
+            paddle_x += self.paddle_speed
+        elif action == 1 and paddle_x > 0:
+            paddle_x -= self.paddle_speed
+
+        # Rebond sur le haut, les côtés et la raquette
+        if y - r <= 0:
+            dy = -dy
+        if x - r < 0 or x + r >= self.WIDTH:
+            dx = -dx
+        if (paddle_x <= x - r <= paddle_x + self.paddle_width
+                and self.paddle_y <= y <= self.paddle_y + self.paddle_height):
+            dy = -abs(dy)
+
+        # Blocs : premier contact parmi les cases voisines, dans l'ordre de _sweep
+        life = self.life[0]
+        row0 = math.floor((y - self.y0) / self.pitch_y)
+        col0 = math.floor((x - self.x0) / self.pitch_x)
+        t, axis, block = math.inf, 0, -1
+        for dr, dc in self._near:
+            row, col = row0 + dr, col0 + dc
+            if not (0 <= row < self.nb_rows and 0 <= col < self.nb_columns):
+                continue
+            b = row * self.nb_columns + col
+            if life[b] <= 0:
+                continue
+            bx, by = self.block_x[b], self.block_y[b]
+            tx_min, tx_max = _slab(x, dx, bx - r, bx + self.bloc_width + r)
+            ty_min, ty_max = _slab(y, dy, by - r, by + self.bloc_height + r)
+            t_enter = max(tx_min, ty_min)
+            t_exit = min(tx_max, ty_max, 1.0)
+            if -1e-9 <= t_enter <= t_exit and t_enter <= 1 and t_exit > 1e-9 and max(t_enter, 0.0) < t:
+                t, axis, block = max(t_enter, 0.0), int(ty_min > tx_min), b
+        hit = block >= 0
+        if not hit:
+            t = 1.0
+        x += dx * t
+        y += dy * t
+        if hit:
+            if axis == 0:
+                dx = -abs(dx) if x < self.block_x[block] + self.bloc_width / 2 else abs(dx)
+            else:
+                dy = -abs(dy) if y < self.block_y[block] + self.bloc_height / 2 else abs(dy)
+            life[block] -= 1
+            if life[block] == 0:
+                self.blocks_left[0] -= 1
+
+        self.ball_x[0], self.ball_y[0], self.ball_dx[0], self.ball_dy[0] = x, y, dx, dy
+        self.paddle_x[0] = paddle_x
+
+        # Balle perdue en bas de l'écran
+        lost = y + r > self.HEIGHT
+        if lost:
+            self.lives[0] -= 1
+            self._reset_balls(self._first)
+
+        reward = float(hit) - lost
+        done = bool(self.lives[0] <= 0 or self.blocks_left[0] == 0)
+        info = {"hit": hit, "lost": lost, "blocks_left": int(self.blocks_left[0])}
+        terminal = None
+        if done:
+            terminal = self._get_obs()[0]
+            self._reset_envs(self._first)
+        return self._get_obs()[0], reward, done, info, terminal
+
+    def close(self):
+        pass
+
+
+class BreakoutEnv(gym.Env):
+    """Environnement gym d'une seule partie de BreakOut, sans fenêtre par défaut.
+
+    Simulé par un VecBreakoutEnv d'une partie, avancé par son chemin scalaire (_step_single) ;
+    render_mode="human" ouvre une fenêtre
+    au premier render() et dessine l'état avec des formes simples (pas d'assets).
+    """
+
+    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, rows: int = 3, ball_speed: int = 7,
+                 render_mode=None, fps: int = 60, seed=None):
+        super(BreakoutEnv, self).__init__()
+        self.vec = VecBreakoutEnv(1, WIDTH, HEIGHT, rows, ball_speed, seed=seed)
+        self.action_space = self.vec.action_space
+        self.observation_space = self.vec.observation_space
+        self.render_mode = render_mode
+        self.fps = fps  # limite d'images par seconde en mode "human", 0 = sans limite
+        self.screen = None
+
+    def reset(self, seed=None):
+        return self.vec.reset(seed)[0]
+
+    def step(self, action):
+        obs, reward, done, info, terminal = self.vec._step_single(int(action))
+        if done:
+            # La partie a déjà été relancée : on renvoie l'observation de fin
+            obs = terminal
+        return obs, reward, done, info
+
+    def render(self):
+        """Affiche le jeu avec Pygame."""
+        if self.render_mode != "human":
+            return
+        import pygame as pg
+        vec = self.vec
+        if self.screen is None:
+            pg.init()
+            self.clock = pg.time.Clock()
+            self.screen = pg.display.set_mode((vec.WIDTH, vec.HEIGHT))
+        pg.event.pump()
+
+        self.screen.fill((0, 0, 0))
+        for x, y, life in zip(vec.block_x, vec.block_y, vec.life[0]):
+            if life > 0:
+                shade = 255 * life // vec.bloc_life
+                pg.draw.rect(self.screen, (shade, 80, 255 - shade), (x, y, vec.bloc_width, vec.bloc_height))
+        pg.draw.rect(self.screen, (255, 255, 255), (vec.paddle_x[0], vec.paddle_y, vec.paddle_width, vec.paddle_height))
+        pg.draw.circle(self.screen, (255, 255, 255), (int(vec.ball_x[0]), int(vec.ball_y[0])), vec.ball_radius)
+        pg.display.flip()
+        self.clock.tick(self.fps)
+
+    def close(self):
+        if self.screen is not None:
+            import pygame as pg
+            pg.quit()
+            self.screen = None
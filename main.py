@@ -1,17 +1,22 @@
 from ultralytics import YOLO
 import cv2
+import sys
 import time
 import mediapipe as mp
 import numpy as np
+from vision.camera_service import open_camera
 
 # Initialisation MediaPipe Hands
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
 
-def initialize_camera(camera_source=0):
-    cap = cv2.VideoCapture(camera_source)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+# Résolution attendue par les calculs en pixels de detect_thumb_gesture et du suivi du poignet
+FRAME_SIZE = (640, 480)
+
+def initialize_camera(camera_source=None):
+    # 640x480 demandé à une caméra ouverte directement ; le flux partagé du CameraService
+    # garde sa propre résolution, les images sont donc remises à FRAME_SIZE dans main()
+    cap = open_camera(camera_source, width=FRAME_SIZE[0], height=FRAME_SIZE[1])
     if not cap.isOpened():
         raise Exception("Error: Cannot open the webcam")
     return cap
@@ -54,7 +59,7 @@ def detect_hand_translation(current_x, prev_x, threshold=5):
         return "left"
     return "immobile"
 
-def main(camera_source=0):
+def main(camera_source=None):
     hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
     cap = initialize_camera(camera_source)
     prev_positions = {"left": None, "right": None}
@@ -64,6 +69,8 @@ def main(camera_source=0):
         ret, frame = cap.read()
         if not ret:
             break
+        if (frame.shape[1], frame.shape[0]) != FRAME_SIZE:
+            frame = cv2.resize(frame, FRAME_SIZE)
 
         # Traitement des mains
         results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
@@ -99,4 +106,6 @@ def main(camera_source=0):
     cv2.destroyAllWindows()
 
 if __name__ == '__main__':
-    main(camera_source=1)
\ No newline at end of file
+    # Source : python main.py [index de caméra | fichier vidéo | dossier d'images | synthetic]
+    source = sys.argv[1] if len(sys.argv) > 1 else None
+    main(int(source) if source is not None and source.isdigit() else source)
\ No newline at end of file
@@ -1,10 +1,11 @@
 import pygame
 import pygame_gui
-from PIL import Image, ImageSequence
-from breakout.breakout import BreakOut
-from pong.pong import Pong
+from asset_registry import registry
 import subprocess
 
+# Les jeux (et avec eux cv2, mediapipe, ultralytics, torch) ne sont importés
+# qu'au moment où on les lance : le menu s'affiche sans les attendre
+
 class Menu:
     def __init__(self, WIDTH: int = 800, HEIGHT: int = 600):
         pygame.init()
@@ -26,16 +27,7 @@ class Menu:
         self.add_buttons()
     
     def load_gif(self, filename):
-        gif = Image.open(filename)
-        frames = []
-        for frame in ImageSequence.Iterator(gif):
-            frame = frame.convert('RGBA')
-            pygame_image = pygame.image.fromstring(
-                frame.tobytes(), frame.size, frame.mode
-            ).convert_alpha()
-            pygame_image = pygame.transform.scale(pygame_image, (self.WIDTH, self.HEIGHT))
-            frames.append(pygame_image)
-        return frames
+        return registry.frames(filename, (self.WIDTH, self.HEIGHT))
 
     def add_buttons(self):
         # Buttons
@@ -86,11 +78,13 @@ class Menu:
                     if event.ui_element == self.pong_button:
                         running = False
                         print("Pong is starting !")
+                        from pong.pong import Pong
                         game = Pong(grid=False)
                         game.run()
                     if event.ui_element == self.breakout_button:
                         running = False
                         print("BreakOut is starting !")
+                        from breakout.breakout import BreakOut
                         game = BreakOut(control="hands", ball_speed=3)
                         game.run()
                     if event.ui_element == self.motus:
@@ -105,17 +99,20 @@ class Menu:
             # Update animation
             self.update_animation()
             
-            # Update UI
-            self.manager.update(time_delta)
-            
-            # Draw everything
-            self.screen.blit(self.gif_frames[self.current_frame], (0, 0))
-            self.manager.draw_ui(self.screen)
-            
-            pygame.display.update()
+            self.draw(time_delta)
 
         pygame.quit()
 
+    def draw(self, time_delta):
+        # Update UI
+        self.manager.update(time_delta)
+        
+        # Draw everything
+        self.screen.blit(self.gif_frames[self.current_frame], (0, 0))
+        self.manager.draw_ui(self.screen)
+        
+        pygame.display.update()
+
 if __name__ == '__main__':
     menu = Menu()
     menu.run()
@@ -6,6 +6,15 @@ import numpy as np
 import random
 from tkinter import messagebox
 import math
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vision.tracking import DetectionScheduler
+from vision.controls import fingers_detector
+from vision.camera_service import open_camera
+
+DETECT_EVERY = 3  # MediaPipe une image sur DETECT_EVERY, flux optique entre les deux
 
 # ==== Partie Mediapipe et Tkinter ====
 mp_hands = mp.solutions.hands
@@ -196,17 +205,12 @@ def update_frame():
 
     frame = cv2.flip(frame, 1)  # Effet miroir
     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(frame_rgb)
-
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            thumb_tip = hand_landmarks.landmark[4]  
-            index_tip = hand_landmarks.landmark[8]  
-            middle_tip = hand_landmarks.landmark[12]  # Majeur
+    track = scheduler(frame)
 
-            h, w, _ = frame.shape
-            thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
-            index_x, index_y = int(index_tip.x * w), int(index_tip.y * h)
+    if track.points is not None:
+        for thumb, index in track.points.reshape(-1, 2, 2):
+            thumb_x, thumb_y = int(thumb[0]), int(thumb[1])
+            index_x, index_y = int(index[0]), int(index[1])
 
             # Calcul de la distance entre l'index et le majeur
             distance_index_middle = calculate_distance((index_x, index_y), (thumb_x, thumb_y))
@@ -237,8 +241,11 @@ def update_frame():
 label = tk.Label(root)
 label.pack()
 
-cap = cv2.VideoCapture(0)
+# Source : python motus.py [index de caméra | fichier vidéo | dossier d'images | synthetic]
+cap = open_camera(sys.argv[1] if len(sys.argv) > 1 else None)
+scheduler = DetectionScheduler(fingers_detector(hands), every=DETECT_EVERY)
 update_frame()
 root.mainloop()
 cap.release()
+print(scheduler.format_stats())
 cv2.destroyAllWindows()
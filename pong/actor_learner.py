@@ -0,0 +1,221 @@
+import time
+import random
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.optim as optim
+from pong_env import PongEnv
+from replay_buffer import ReplayBuffer
+from train_pong import (DQN, BATCH_SIZE, LEARNING_RATE, EPSILON_START, EPSILON_END, EPSILON_DECAY,
+                        TARGET_UPDATE_FREQ, REPLAY_MEMORY_SIZE, PRIORITIZED_REPLAY, PER_ALPHA,
+                        PER_BETA_START, PER_BETA_STEPS, device, preprocess_state, epsilon_greedy,
+                        optimize_model, evaluate_agent)
+
+QUEUE_SLOTS = 65_536      # transitions en attente par acteur
+ACTOR_FLUSH = 64          # transitions regroupées avant écriture dans la file
+ACTOR_SYNC_STEPS = 1_000  # pas entre deux vérifications des poids publiés
+PUBLISH_FREQ = 500        # mises à jour du learner entre deux publications des poids
+EVAL_UPDATES = 20_000     # mises à jour du learner entre deux évaluations
+REPORT_SECONDS = 10.0
+
+
+class TransitionQueue:
+    """File circulaire en mémoire partagée : un acteur écrit, le learner lit.
+
+    Une ligne contient (state, action, reward, next_state, done) en float32.
+    `head` n'est avancé qu'après l'écriture des données, `tail` qu'après leur lecture,
+    ce qui suffit avec un seul producteur et un seul consommateur.
+    """
+
+    def __init__(self, ctx, slots, state_dim):
+        self.slots = slots
+        self.state_dim = state_dim
+        self.width = 2 * state_dim + 3
+        self.buffer = ctx.RawArray("f", slots * self.width)
+        self.head = ctx.RawValue("q", 0)
+        self.tail = ctx.RawValue("q", 0)
+
+    def rows(self):
+        return np.frombuffer(self.buffer, dtype=np.float32).reshape(self.slots, self.width)
+
+    def put(self, rows, stop):
+        """Écrit un bloc de lignes ; attend si le learner est en retard. Renvoie le nombre d'attentes."""
+        n = len(rows)
+        stalls = 0
+        while self.head.value + n - self.tail.value > self.slots:
+            if stop.is_set():
+                return stalls
+            stalls += 1
+            time.sleep(0.001)
+        data = self.rows()
+        start = self.head.value % self.slots
+        first = min(n, self.slots - start)
+        data[start:start + first] = rows[:first]
+        data[:n - first] = rows[first:]
+        self.head.value += n
+        return stalls
+
+    def drain(self):
+        """Copie et retire toutes les lignes disponibles."""
+        head = self.head.value
+        tail = self.tail.value
+        if head == tail:
+            return None
+        data = self.rows()
+        idx = np.arange(tail, head) % self.slots
+        rows = data[idx]
+        self.tail.value = head
+        return rows
+
+    def split(self, rows):
+        """Découpe des lignes en (states, actions, rewards, next_states, dones)."""
+        d = self.state_dim
+        return (rows[:, :d], rows[:, d].astype(np.int64), rows[:, d + 1],
+                rows[:, d + 2:2 * d + 2], rows[:, 2 * d + 2] > 0.5)
+
+
+def actor_loop(actor_id, queue, shared_net, weights_lock, weights_version, steps, stalls, stop, seed):
+    """Processus acteur : joue sur son propre PongEnv et envoie les transitions au learner."""
+    torch.set_num_threads(1)
+    random.seed(seed)
+    np.random.seed(seed)
+
+    env = PongEnv()
+    state = preprocess_state(env.reset())
+    net = DQN(len(state), env.action_space.n)
+    with weights_lock:
+        net.load_state_dict(shared_net.state_dict())
+        version = weights_version.value
+    net.eval()
+
+    epsilon = EPSILON_START
+    pending = np.zeros((ACTOR_FLUSH, queue.width), dtype=np.float32)
+    d = queue.state_dim
+    n = 0
+    local_steps = 0
+
+    while not stop.is_set():
+        action = epsilon_greedy(state, epsilon, net)
+        next_state, reward, done, _ = env.step(action)
+        next_state = preprocess_state(next_state)
+
+        row = pending[n]
+        row[:d] = state
+        row[d] = action
+        row[d + 1] = reward
+        row[d + 2:2 * d + 2] = next_state
+        row[2 * d + 2] = done
+        n += 1
+
+        state = preprocess_state(env.reset()) if done else next_state
+        epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
+        local_steps += 1
+
+        if n == ACTOR_FLUSH:
+            stalls[actor_id] += queue.put(pending, stop)
+            steps[actor_id] += n
+            n = 0
+
+        # Récupère les derniers poids publiés par le learner
+        if local_steps % ACTOR_SYNC_STEPS == 0 and weights_version.value != version:
+            with weights_lock:
+                net.load_state_dict(shared_net.state_dict())
+                version = weights_version.value
+
+
+def train_distributed(n_actors, max_updates=2_000_000):
+    """Entraînement acteurs/learner : n_actors processus collectent, le processus courant apprend."""
+    ctx = mp.get_context("spawn")
+    env = PongEnv()
+    n_actions = env.action_space.n
+    state_dim = len(preprocess_state(env.reset()))
+
+    policy_net = DQN(state_dim, n_actions).to(device)
+    target_net = DQN(state_dim, n_actions).to(device)
+    target_net.load_state_dict(policy_net.state_dict())
+    target_net.eval()
+    optimizer = optim.Adam(policy_net.parameters(), lr=LEARNING_RATE)
+    memory = ReplayBuffer(REPLAY_MEMORY_SIZE, state_dim, prioritized=PRIORITIZED_REPLAY, alpha=PER_ALPHA)
+
+    # Copie CPU des poids, partagée avec les acteurs
+    shared_net = DQN(state_dim, n_actions)
+    shared_net.load_state_dict(policy_net.state_dict())
+    shared_net.share_memory()
+    weights_lock = ctx.Lock()
+    weights_version = ctx.RawValue("q", 0)
+
+    steps = ctx.RawArray("q", n_actors)
+    stalls = ctx.RawArray("q", n_actors)
+    stop = ctx.Event()
+    queues = [TransitionQueue(ctx, QUEUE_SLOTS, state_dim) for _ in range(n_actors)]
+    actors = [
+        ctx.Process(target=actor_loop, daemon=True,
+                    args=(i, queues[i], shared_net, weights_lock, weights_version, steps, stalls, stop, 1_000 + i))
+        for i in range(n_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    best_reward = -float('inf')
+    updates = 0
+    ingested = 0
+    last_report = time.perf_counter()
+    last_steps = [0] * n_actors
+    last_updates = 0
+    last_ingested = 0
+
+    try:
+        while updates < max_updates:
+            for queue in queues:
+                rows = queue.drain()
+                if rows is not None:
+                    memory.add_batch(*queue.split(rows))
+                    ingested += len(rows)
+
+            if len(memory) < BATCH_SIZE:
+                time.sleep(0.01)
+                continue
+
+            beta = min(1.0, PER_BETA_START + updates * (1.0 - PER_BETA_START) / PER_BETA_STEPS)
+            batch = memory.sample(BATCH_SIZE, beta)
+            td_errors = optimize_model(policy_net, target_net, optimizer, batch)
+            memory.update_priorities(batch[5], td_errors)
+            updates += 1
+
+            if updates % TARGET_UPDATE_FREQ == 0:
+                target_net.load_state_dict(policy_net.state_dict())
+
+            if updates % PUBLISH_FREQ == 0:
+                with weights_lock:
+                    shared_net.load_state_dict(policy_net.state_dict())
+                    weights_version.value += 1
+
+            if updates % EVAL_UPDATES == 0:
+                stats = evaluate_agent(policy_net)
+                eval_reward = stats["reward"].mean()
+                print(f"Update {updates} | Eval Reward: {eval_reward:.1f} | Eval Length: {stats['length'].mean():.0f} "
+                      f"| Eval Hits: {stats['hits'].mean():.1f}")
+                if eval_reward > best_reward:
+                    print("Saved")
+                    torch.save(policy_net.state_dict(), "pong_best.pth")
+                    best_reward = eval_reward
+
+            now = time.perf_counter()
+            if now - last_report >= REPORT_SECONDS:
+                elapsed = now - last_report
+                actor_rates = [(steps[i] - last_steps[i]) / elapsed for i in range(n_actors)]
+                print(" | ".join(f"actor {i}: {rate:.0f} steps/s ({stalls[i]} stalls)"
+                                 for i, rate in enumerate(actor_rates)))
+                print(f"learner: {(updates - last_updates) / elapsed:.0f} updates/s | "
+                      f"ingest: {(ingested - last_ingested) / elapsed:.0f} transitions/s | "
+                      f"total: {sum(actor_rates):.0f} steps/s | replay: {len(memory)}")
+                last_report = now
+                last_steps = list(steps)
+                last_updates = updates
+                last_ingested = ingested
+    finally:
+        stop.set()
+        for actor in actors:
+            actor.join(timeout=5)
+
+    return policy_net
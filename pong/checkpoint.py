@@ -0,0 +1,112 @@
+import os
+import copy
+import random
+import threading
+import numpy as np
+import torch
+
+
+def snapshot(obj):
+    """Copie profonde détachée de l'entraînement : tenseurs recopiés sur CPU, tableaux recopiés."""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, np.ndarray):
+        return obj.copy()
+    if isinstance(obj, dict):
+        return {key: snapshot(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(snapshot(value) for value in obj)
+    return copy.deepcopy(obj)
+
+
+def rng_state():
+    """États des générateurs aléatoires Python, NumPy et PyTorch."""
+    state = {
+        "python": random.getstate(),
+        "numpy": np.random.get_state(),
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def set_rng_state(state):
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+class Checkpointer:
+    """Écrit les checkpoints dans un thread d'arrière-plan.
+
+    save() prend une copie de l'état dans le thread appelant puis rend la main sans jamais
+    attendre le disque : si une écriture vers le même chemin est encore en attente, elle est
+    remplacée par la plus récente. `before` (par exemple ReplayBuffer.flush) est appelé dans le
+    thread d'écriture juste avant torch.save. L'écriture se fait dans un fichier temporaire
+    renommé à la fin, pour ne jamais laisser un checkpoint à moitié écrit.
+    """
+
+    def __init__(self):
+        self.pending = {}  # chemin -> (état, before), dans l'ordre des demandes
+        self.writing = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.error = None
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def save(self, state, path, before=None):
+        if self.error is not None:
+            raise self.error
+        state = snapshot(state)
+        with self.condition:
+            self.pending[path] = (state, before)
+            self.condition.notify_all()
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if not self.pending:
+                    return
+                path = next(iter(self.pending))
+                state, before = self.pending.pop(path)
+                self.writing = True
+            try:
+                if before is not None:
+                    before()
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = path + ".tmp"
+                torch.save(state, tmp_path)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                self.error = e
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def wait(self):
+        """Attend la fin des écritures en cours."""
+        with self.condition:
+            self.condition.wait_for(lambda: not self.pending and not self.writing)
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Termine les écritures en attente puis arrête le thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+def load_checkpoint(path, map_location=None):
+    # Le checkpoint contient aussi les états RNG (objets Python), d'où weights_only=False
+    return torch.load(path, map_location=map_location, weights_only=False)
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+COLUMNS = {
+    "states": np.float32,
+    "actions": np.uint8,
+    "rewards": np.float32,
+    "next_states": np.float32,
+    "dones": np.bool_,
+    "episodes": np.uint32,
+}
+BATCH_COLUMNS = ("states", "actions", "rewards", "next_states", "dones")
+
+
+class TrajectoryRecorder:
+    """Enregistre des transitions dans des fichiers par blocs (chunks), colonne par colonne.
+
+    Chaque chunk de `chunk_size` transitions est écrit par défaut en un dossier de .npy
+    non compressés que le chargeur mappe en mémoire, ou en .npz compressé sur demande
+    (compress=True, plus petit sur disque mais décompressé en entier au chargement). meta.json liste les chunks écrits ;
+    un dossier existant est complété, pas écrasé.
+    """
+
+    def __init__(self, path, state_dim=6, chunk_size=100_000, compress=False):
+        self.path = path
+        self.state_dim = state_dim
+        self.chunk_size = chunk_size
+        self.compress = compress
+        os.makedirs(path, exist_ok=True)
+
+        self.meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"state_dim": state_dim, "chunks": [], "size": 0, "episodes": 0}
+        self.episode = self.meta["episodes"]
+
+        self.buffer = {
+            name: np.zeros((chunk_size, state_dim) if name.endswith("states") else (chunk_size,), dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+        self.n = 0
+
+    def __len__(self):
+        return self.meta["size"] + self.n
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.n
+        self.buffer["states"][i] = state
+        self.buffer["actions"][i] = action
+        self.buffer["rewards"][i] = reward
+        self.buffer["next_states"][i] = next_state
+        self.buffer["dones"][i] = done
+        self.buffer["episodes"][i] = self.episode
+        self.n += 1
+        if done:
+            self.episode += 1
+        if self.n == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Écrit les transitions en attente dans un nouveau chunk."""
+        if self.n == 0:
+            return
+        name = f"chunk_{len(self.meta['chunks']):05d}"
+        columns = {key: value[:self.n] for key, value in self.buffer.items()}
+        if self.compress:
+            filename = name + ".npz"
+            np.savez_compressed(os.path.join(self.path, filename), **columns)
+        else:
+            filename = name
+            os.makedirs(os.path.join(self.path, filename), exist_ok=True)
+            for key, value in columns.items():
+                np.save(os.path.join(self.path, filename, key + ".npy"), value)
+
+        self.meta["chunks"].append({"file": filename, "size": self.n})
+        self.meta["size"] += self.n
+        self.meta["episodes"] = self.episode
+        self.n = 0
+
+        # meta.json remplacé d'un coup : un chunk n'est visible qu'une fois complètement écrit
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f, indent=1)
+        os.replace(tmp_path, self.meta_path)
+
+    def close(self):
+        self.flush()
+
+
+class TrajectoryDataset:
+    """Lit un dossier écrit par TrajectoryRecorder sans charger tout le jeu de données en RAM."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.chunks = self.meta["chunks"]
+
+    def __len__(self):
+        return self.meta["size"]
+
+    def chunk(self, i):
+        """Colonnes du chunk i : fichiers .npy mappés en mémoire, ou .npz décompressé."""
+        filename = os.path.join(self.path, self.chunks[i]["file"])
+        if filename.endswith(".npz"):
+            with np.load(filename) as data:
+                return {name: data[name] for name in COLUMNS}
+        return {name: np.load(os.path.join(filename, name + ".npy"), mmap_mode="r") for name in COLUMNS}
+
+    def batches(self, batch_size=128, shuffle=True, seed=None, chunks_in_memory=4, drop_last=True):
+        """Génère des lots (states, actions, rewards, next_states, dones, indices, weights).
+
+        Le format est celui de ReplayBuffer.sample, pour passer directement à optimize_model.
+        Le mélange se fait sur une fenêtre de `chunks_in_memory` chunks tirés au hasard :
+        la mémoire utilisée est bornée par la fenêtre, pas par la taille du jeu de données.
+        """
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.chunks)) if shuffle else np.arange(len(self.chunks))
+        weights = np.ones(batch_size, dtype=np.float32)
+        offsets = np.concatenate([[0], np.cumsum([c["size"] for c in self.chunks])])
+
+        for start in range(0, len(order), chunks_in_memory):
+            window = order[start:start + chunks_in_memory]
+            columns = [self.chunk(i) for i in window]
+            sizes = np.array([self.chunks[i]["size"] for i in window])
+            # Indices (chunk de la fenêtre, position dans le chunk) de toutes les transitions
+            which = np.repeat(np.arange(len(window)), sizes)
+            within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            perm = rng.permutation(len(which)) if shuffle else np.arange(len(which))
+
+            stop = len(perm) - batch_size + 1 if drop_last else len(perm)
+            for b in range(0, max(stop, 0), batch_size):
+                picked = perm[b:b + batch_size]
+                batch = {name: [] for name in BATCH_COLUMNS}
+                indices = []
+                for j in range(len(window)):
+                    # Lecture triée dans chaque chunk : accès séquentiels sur les fichiers mappés
+                    rows = np.sort(within[picked[which[picked] == j]])
+                    for name in BATCH_COLUMNS:
+                        batch[name].append(columns[j][name][rows])
+                    indices.append(rows + offsets[window[j]])
+                arrays = {name: np.concatenate(values) for name, values in batch.items()}
+                yield (
+                    arrays["states"],
+                    arrays["actions"].astype(np.int64),
+                    arrays["rewards"],
+                    arrays["next_states"],
+                    arrays["dones"],
+                    np.concatenate(indices),  # indices globaux des transitions
+                    weights[:len(picked)],
+                )
+
+
+def bot_policy(obs):
+    """Politique scriptée : suit la balle, comme le bot de droite (observation normalisée de PongEnv)."""
+    paddle_center = obs[4] + 50 / 720  # milieu de la raquette (hauteur 100 px sur 720)
+    if obs[1] > paddle_center:
+        return 2
+    if obs[1] < paddle_center:
+        return 1
+    return 0
+
+
+def record(recorder, env, policy, n_steps, epsilon=0.0, seed=None):
+    """Joue `policy` (observation -> action) dans env pendant n_steps pas et enregistre les transitions.
+
+    policy peut être bot_policy, PolicyRunner.act, PolicyTable.act...
+    epsilon ajoute des actions aléatoires pour diversifier les états.
+    """
+    rng = np.random.default_rng(seed)
+    # États ramenés dans [0, 1] comme preprocess_state : les lots sont utilisables tels quels
+    state = np.clip(env.reset(), 0, 1)
+    for _ in range(n_steps):
+        if rng.random() < epsilon:
+            action = int(rng.integers(0, env.action_space.n))
+        else:
+            action = policy(state)
+        next_state, reward, done, _ = env.step(action)
+        next_state = np.clip(next_state, 0, 1)
+        recorder.add(state, action, reward, next_state, done)
+        state = np.clip(env.reset(), 0, 1) if done else next_state
+    recorder.flush()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Enregistrement et lecture de trajectoires PongEnv")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rec = subparsers.add_parser("record", help="génère un jeu de données")
+    rec.add_argument("out", help="dossier du jeu de données (complété s'il existe)")
+    rec.add_argument("--policy", default="bot", help="bot, random, ou modèle (.pth/.pt/.npz)")
+    rec.add_argument("--steps", type=int, default=1_000_000)
+    rec.add_argument("--epsilon", type=float, default=0.1)
+    rec.add_argument("--chunk-size", type=int, default=100_000)
+    rec.add_argument("--compress", action="store_true", help="chunks .npz compressés au lieu de .npy mappables")
+    rec.add_argument("--seed", type=int, default=None)
+    bench = subparsers.add_parser("bench", help="débit du chargeur")
+    bench.add_argument("path")
+    bench.add_argument("--batch-size", type=int, default=128)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        from pong_env import PongEnv
+        env = PongEnv()
+        if args.policy == "bot":
+            policy = bot_policy
+        elif args.policy == "random":
+            policy = lambda obs: env.action_space.sample()
+        elif args.policy.endswith(".npz"):
+            from policy_table import PolicyTable
+            policy = PolicyTable.load(args.policy).act
+        else:
+            from inference import PolicyRunner
+            policy = PolicyRunner.load(args.policy).act
+        recorder = TrajectoryRecorder(args.out, chunk_size=args.chunk_size, compress=args.compress)
+        start = time.perf_counter()
+        record(recorder, env, policy, args.steps, args.epsilon, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"{args.steps} transitions en {elapsed:.1f}s ({args.steps / elapsed:.0f}/s), "
+              f"{len(recorder)} au total dans {args.out}")
+    else:
+        dataset = TrajectoryDataset(args.path)
+        start = time.perf_counter()
+        n = sum(len(batch[1]) for batch in dataset.batches(args.batch_size))
+        elapsed = time.perf_counter() - start
+        print(f"{n} transitions ({len(dataset)} dans le jeu) en {elapsed:.1f}s : {n / elapsed:.0f} transitions/s")
@@ -0,0 +1,44 @@
+import numpy as np
+import torch
+from vec_pong_env import VecPongEnv
+
+
+def evaluate_policy(net, n_episodes=100, seed=0, max_steps=10_000):
+    """Joue n_episodes parties en parallèle avec une politique gloutonne et des graines fixes.
+
+    Toutes les parties avancent au même rythme dans un VecPongEnv qui leur est propre,
+    avec un seul passage avant du réseau par tick pour les parties encore en cours.
+    Renvoie un dict de tableaux par épisode : reward, length, hits et truncated
+    (partie arrêtée après max_steps ticks).
+    """
+    env = VecPongEnv(num_envs=n_episodes, seed=seed)
+    device = next(net.parameters()).device
+    states = np.clip(env.reset(), 0, 1)
+
+    rewards = np.zeros(n_episodes, dtype=np.float32)
+    lengths = np.zeros(n_episodes, dtype=np.int64)
+    hits = np.zeros(n_episodes, dtype=np.int64)
+    running = np.ones(n_episodes, dtype=bool)
+    actions = np.zeros(n_episodes, dtype=np.int64)
+
+    for _ in range(max_steps):
+        if not running.any():
+            break
+        with torch.no_grad():
+            q_values = net(torch.from_numpy(states[running]).to(device))
+        actions[running] = q_values.argmax(dim=1).cpu().numpy()
+
+        # Les parties terminées sont relancées par l'environnement mais ne sont plus comptées
+        next_states, reward, done, info = env.step(actions)
+        rewards[running] += reward[running]
+        lengths[running] += 1
+        hits[running] += info["hit"][running]
+        running &= ~done
+        states = np.clip(next_states, 0, 1)
+
+    return {
+        "reward": rewards,
+        "length": lengths,
+        "hits": hits,
+        "truncated": running,
+    }
@@ -0,0 +1,124 @@
+import os
+import time
+import argparse
+import numpy as np
+import torch
+import torch.nn as nn
+from train_pong import DQN
+
+STATE_DIM = 6
+N_ACTIONS = 3
+
+
+def load_eager(model_path, state_dim=STATE_DIM, n_actions=N_ACTIONS):
+    """Charge les poids entraînés dans le DQN eager, sur CPU, en mode évaluation."""
+    model = DQN(state_dim, n_actions)
+    model.load_state_dict(torch.load(model_path, map_location="cpu"))
+    return model.eval()
+
+
+def export(model_path="pong_best.pth", out_dir="."):
+    """Écrit une version TorchScript fp32 et une version TorchScript quantifiée int8 du DQN."""
+    model = load_eager(model_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    scripted = torch.jit.freeze(torch.jit.script(model))
+    scripted_path = os.path.join(out_dir, "pong_scripted.pt")
+    scripted.save(scripted_path)
+
+    # Quantification dynamique : poids des couches linéaires en int8, activations quantifiées à la volée
+    quantized = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    example = torch.zeros(1, STATE_DIM)
+    quantized_path = os.path.join(out_dir, "pong_int8.pt")
+    torch.jit.trace(quantized, example).save(quantized_path)
+
+    return scripted_path, quantized_path
+
+
+class PolicyRunner:
+    """Exécute une politique (eager ou TorchScript) avec un tampon d'entrée préalloué.
+
+    act() renvoie l'action pour un état, act_batch() pour un lot d'états.
+    Les états sont copiés dans le tampon : aucun tenseur n'est alloué par décision.
+    """
+
+    def __init__(self, model, max_batch=1024, state_dim=STATE_DIM):
+        self.model = model
+        self.max_batch = max_batch
+        self._input = torch.zeros(max_batch, state_dim)
+        self._input_np = self._input.numpy()  # vue NumPy sur le même tampon
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Charge un export TorchScript (.pt) ou des poids eager (.pth)."""
+        if path.endswith(".pt"):
+            model = torch.jit.load(path, map_location="cpu").eval()
+        else:
+            model = load_eager(path)
+        return cls(model, **kwargs)
+
+    def act(self, state):
+        self._input_np[0] = state
+        with torch.inference_mode():
+            q_values = self.model(self._input[:1])
+        return int(q_values.argmax())
+
+    def act_batch(self, states):
+        n = len(states)
+        if n > self.max_batch:
+            return np.concatenate([self.act_batch(states[i:i + self.max_batch])
+                                   for i in range(0, n, self.max_batch)])
+        self._input_np[:n] = states
+        with torch.inference_mode():
+            q_values = self.model(self._input[:n])
+        return q_values.argmax(dim=1).numpy()
+
+
+def benchmark(model_path="pong_best.pth", out_dir=".", n_iters=2000, batch_sizes=(1, 64, 1024)):
+    """Compare la latence CPU des versions eager, TorchScript et int8."""
+    scripted_path, quantized_path = export(model_path, out_dir)
+    runners = {
+        "eager": PolicyRunner.load(model_path),
+        "scripted": PolicyRunner.load(scripted_path),
+        "int8": PolicyRunner.load(quantized_path),
+    }
+    states = np.random.rand(max(batch_sizes), STATE_DIM).astype(np.float32)
+
+    results = {}
+    for name, runner in runners.items():
+        for batch_size in batch_sizes:
+            batch = states[:batch_size]
+            act = (lambda: runner.act(batch[0])) if batch_size == 1 else (lambda: runner.act_batch(batch))
+            for _ in range(50):  # échauffement (optimisations TorchScript au premier appel)
+                act()
+            iters = max(10, n_iters // batch_size)
+            start = time.perf_counter()
+            for _ in range(iters):
+                act()
+            per_call = (time.perf_counter() - start) / iters
+            results[(name, batch_size)] = per_call
+            print(f"{name:>8} | batch {batch_size:>5} | {per_call * 1e6:9.1f} µs/appel "
+                  f"| {per_call / batch_size * 1e6:7.2f} µs/décision")
+
+    # Les versions exportées doivent choisir les mêmes actions que le modèle eager
+    reference = runners["eager"].act_batch(states)
+    for name in ("scripted", "int8"):
+        agreement = (runners[name].act_batch(states) == reference).mean()
+        print(f"accord {name}/eager : {agreement:.1%}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export et benchmark du DQN Pong pour l'inférence CPU")
+    parser.add_argument("command", choices=["export", "bench"])
+    parser.add_argument("--model", default="pong_best.pth", help="poids entraînés (state_dict)")
+    parser.add_argument("--out", default=".", help="dossier des modèles exportés")
+    parser.add_argument("--threads", type=int, default=1, help="threads PyTorch (1 = latence minimale)")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    if args.command == "export":
+        for path in export(args.model, args.out):
+            print(f"Écrit : {path}")
+    else:
+        benchmark(args.model, args.out)
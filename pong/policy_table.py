@@ -0,0 +1,99 @@
+import argparse
+import numpy as np
+
+# Observation de PongEnv._get_obs après preprocess_state (valeurs ramenées dans [0, 1])
+DEFAULT_BINS = (32, 24, 2, 2, 24, 8)
+DEFAULT_LOW = (0.0,) * 6
+DEFAULT_HIGH = (1.0,) * 6
+
+
+class PolicyTable:
+    """Politique compilée en table d'actions (uint8) sur une grille de l'observation.
+
+    Chaque dimension est discrétisée en `bins` points régulièrement espacés entre low et
+    high ; une observation est ramenée au point de grille le plus proche. La lecture est
+    en O(1) et ne nécessite que NumPy (pas de torch à l'exécution).
+    """
+
+    def __init__(self, table, low=DEFAULT_LOW, high=DEFAULT_HIGH):
+        self.table = np.asarray(table, dtype=np.uint8)
+        self.bins = np.array(self.table.shape)
+        self.low = np.asarray(low, dtype=np.float32)
+        self.high = np.asarray(high, dtype=np.float32)
+        self._scale = (self.bins - 1) / (self.high - self.low)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["table"], data["low"], data["high"])
+
+    def save(self, path):
+        np.savez_compressed(path, table=self.table, low=self.low, high=self.high)
+
+    def grid(self):
+        """Points de la grille, une liste de tableaux par dimension."""
+        return [np.linspace(l, h, b, dtype=np.float32) for l, h, b in zip(self.low, self.high, self.bins)]
+
+    def indices(self, obs):
+        obs = np.clip(obs, self.low, self.high)
+        return np.rint((obs - self.low) * self._scale).astype(np.intp)
+
+    def act(self, obs):
+        return int(self.table[tuple(self.indices(obs))])
+
+    def act_batch(self, obs):
+        return self.table[tuple(self.indices(obs).T)]
+
+
+def compile_table(runner, bins=DEFAULT_BINS, low=DEFAULT_LOW, high=DEFAULT_HIGH, batch_size=65_536):
+    """Évalue la politique sur tous les points de la grille, par lots."""
+    policy = PolicyTable(np.zeros(bins, dtype=np.uint8), low, high)
+    grid = policy.grid()
+    flat = policy.table.reshape(-1)
+    for start in range(0, flat.size, batch_size):
+        stop = min(start + batch_size, flat.size)
+        idx = np.unravel_index(np.arange(start, stop), policy.table.shape)
+        states = np.stack([grid[d][idx[d]] for d in range(len(grid))], axis=1)
+        flat[start:stop] = runner.act_batch(states)
+    return policy
+
+
+def held_out_states(runner, n_states=100_000, epsilon=0.1, num_envs=256, seed=0):
+    """États visités en jouant la politique (avec un peu d'exploration) dans VecPongEnv."""
+    from vec_pong_env import VecPongEnv
+    env = VecPongEnv(num_envs=num_envs, seed=seed)
+    rng = np.random.default_rng(seed)
+    states = np.empty((n_states, 6), dtype=np.float32)
+    obs = np.clip(env.reset(), 0, 1)
+    for start in range(0, n_states, num_envs):
+        stop = min(start + num_envs, n_states)
+        states[start:stop] = obs[:stop - start]
+        actions = runner.act_batch(obs)
+        explore = rng.random(num_envs) < epsilon
+        actions[explore] = rng.integers(0, 3, explore.sum())
+        obs, _, _, _ = env.step(actions)
+        obs = np.clip(obs, 0, 1)
+    return states
+
+
+def agreement(policy, runner, states):
+    """Fraction des états où la table choisit la même action que le réseau."""
+    return float((policy.act_batch(states) == runner.act_batch(states)).mean())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compile le DQN Pong en table d'actions pour Pong")
+    parser.add_argument("--model", default="pong_best.pth", help="poids (.pth) ou modèle exporté (.pt)")
+    parser.add_argument("--bins", type=int, nargs=6, default=DEFAULT_BINS,
+                        help="points de grille par dimension (ball_x ball_y dx dy player_y bot_y)")
+    parser.add_argument("--out", default="pong_table.npz")
+    parser.add_argument("--held-out", type=int, default=100_000, help="nombre d'états pour mesurer l'accord")
+    args = parser.parse_args()
+
+    from inference import PolicyRunner
+    runner = PolicyRunner.load(args.model, max_batch=65_536)
+    policy = compile_table(runner, tuple(args.bins))
+    policy.save(args.out)
+    print(f"Table {policy.table.shape} ({policy.table.nbytes / 1024:.0f} Ko) écrite dans {args.out}")
+    print(f"Accord table/réseau sur {args.held_out} états : "
+          f"{agreement(policy, runner, held_out_states(runner, args.held_out)):.1%}")
@@ -1,15 +1,27 @@
 import pygame as pg
 import numpy as np
 import sys
-import cv2
-from ultralytics import YOLO
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from asset_registry import registry
+from policy_table import PolicyTable
+from vision.latency import LatencyTracer
+
+VISION_MAX_AGE = 0.5  # secondes au-delà desquelles une détection est ignorée
+CONTROL_LABELS = ("bottle", "cell phone")  # bouteille : descendre, téléphone : monter
+YOLO_IMGSZ = 320
+DETECT_EVERY = 3  # YOLO une image sur DETECT_EVERY, flux optique entre les deux
 
 class Pong:
-    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, grid=True, camera_source:int=0):
+    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, grid=True, camera_source=None, opponent_table=None,
+                 control:str="yolo", fps:int=60, detection:str="roi", trace=None):
         pg.init()
         self.clock = pg.time.Clock()
         self.WIDTH = WIDTH
         self.HEIGHT = HEIGHT
+        self.fps = fps  # 0 = sans limite d'images par seconde
 
         self.ball_radius = 10
         self.paddle_width = 10
@@ -21,25 +33,46 @@ class Pong:
         self.score_player_1 = 0
         self.score_player_2 = 0
 
-        # Initialisation YOLO et webcam
-        self.model = YOLO("yolo11n.pt")
-        self.cap = cv2.VideoCapture(camera_source)
+        # Latence capture -> affichage : F3 affiche le HUD, traces écrites en CSV dans `trace` à la fermeture
+        self.tracer = LatencyTracer(path=trace)
+
+        # Adversaire : table d'actions compilée (policy_table.py) ou suivi simple de la balle
+        self.opponent = PolicyTable.load(opponent_table) if opponent_table else None
+
+        # control="yolo" : raquette pilotée par la caméra, control="keyboard" : flèches haut/bas
+        # camera_source : toute source de vision.frame_source (caméra, vidéo, dossier d'images, synthetic)
+        self.control_type = control
+        self.model = None
+        self.vision = None
+        if self.control_type == "yolo":
+            # Imports lourds (torch, cv2) seulement en mode caméra
+            from ultralytics import YOLO
+            from vision.pipeline import VisionPipeline
+            from vision.controls import yolo_detector
+            from vision.tracking import DetectionScheduler
+            self.model = YOLO("yolo11n.pt")
+            # detection="roi" : classes de contrôle seulement, entrée réduite, recadrage sur la dernière détection
+            # detection="full" : toutes les classes sur l'image entière
+            detect = yolo_detector(self.model, CONTROL_LABELS, roi=detection == "roi", imgsz=YOLO_IMGSZ)
+            self.scheduler = DetectionScheduler(detect, every=DETECT_EVERY)
+            # Capture et inférence dans leurs propres threads : la boucle de jeu ne les attend pas
+            self.vision = VisionPipeline(camera_source, lambda frame: self.scheduler(frame).value).start()
+        self.load_asset()
         self.reset()
     
     def load_asset(self):
         if self.grid:
-            self.background = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Background  Grid.png")
+            self.background = registry.image("pong/Neon Pong Assets/Neon Pong/images/Background  Grid.png")
         else:
-            self.background = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Background Empty.png")
+            self.background = registry.image("pong/Neon Pong Assets/Neon Pong/images/Background Empty.png")
 
-        self.paddle_left_img = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Paddle_1.png")
-        self.paddle_right_img = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Paddle_2.png")
-        self.ball_img = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Ball.png")
+        self.paddle_left_img = registry.image("pong/Neon Pong Assets/Neon Pong/images/Paddle_1.png", alpha=True)
+        self.paddle_right_img = registry.image("pong/Neon Pong Assets/Neon Pong/images/Paddle_2.png", alpha=True)
+        self.ball_img = registry.image("pong/Neon Pong Assets/Neon Pong/images/Ball.png", alpha=True)
 
-        self.police_asset = pg.font.Font("pong/Neon Pong Assets/Micro5-Regular.ttf", 50)
+        self.police_asset = registry.font("pong/Neon Pong Assets/Micro5-Regular.ttf", 50)
 
     def reset(self):
-        self.load_asset()
         self.update_score()
         self.ball_x = self.WIDTH // 2
         self.ball_y = self.HEIGHT // 2
@@ -61,31 +94,53 @@ class Pong:
         self.textRect_2 = self.text_score_player_2.get_rect(center=(self.WIDTH // 2 + 40, 50))
 
     def control(self):
-        """Contrôle le paddle du joueur via la caméra et YOLO"""
-        ret, frame = self.cap.read()
-        if not ret:
+        """Contrôle le paddle du joueur avec la dernière détection publiée, sans bloquer"""
+        result = self.vision.latest(max_age=VISION_MAX_AGE)
+        if result is None:
             return
-        
-        results = self.model(frame)
-        detected_object = None
-        for r in results:
-            for box in r.boxes:
-                cls = int(box.cls[0])
-                label = self.model.names[cls]
-                if label in ["bottle", "cell phone"]:
-                    detected_object = label
+        self.tracer.control(result.seq, result.captured_at, result.detected_at)
+        detected_object = result.value
 
         if detected_object == "cell phone" and self.paddle_player_y > 0:
             self.paddle_player_y -= self.paddle_speed
         elif detected_object == "bottle" and self.paddle_player_y < self.HEIGHT - self.paddle_height:
             self.paddle_player_y += self.paddle_speed
 
+    def control_keyboard(self):
+        """Détecte les touches pressées pour bouger la raquette."""
+        keys = pg.key.get_pressed()
+        if (keys[pg.K_s] or keys[pg.K_DOWN]) and self.paddle_player_y < self.HEIGHT - self.paddle_height:
+            self.paddle_player_y += self.paddle_speed
+        if (keys[pg.K_z] or keys[pg.K_UP]) and self.paddle_player_y > 0:
+            self.paddle_player_y -= self.paddle_speed
+
     def check_event(self):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 self.close()
+            if event.type == pg.KEYDOWN and event.key == pg.K_F3:
+                self.tracer.toggle_hud()
+
+    def opponent_obs(self):
+        """Observation vue depuis la raquette de droite, comme si elle était l'agent de gauche"""
+        return np.array([
+            (self.WIDTH - self.ball_x) / self.WIDTH,
+            self.ball_y / self.HEIGHT,
+            -self.ball_dx / 7,
+            self.ball_dy / 7,
+            self.paddle_bot_y / self.HEIGHT,
+            self.paddle_player_y / self.HEIGHT,
+        ], dtype=np.float32)
 
     def bot_movement(self):
+        if self.opponent is not None:
+            action = self.opponent.act(self.opponent_obs())
+            if action == 1 and self.paddle_bot_y > 0:
+                self.paddle_bot_y -= self.paddle_speed
+            elif action == 2 and self.paddle_bot_y < self.HEIGHT - self.paddle_height:
+                self.paddle_bot_y += self.paddle_speed
+            return
+
         if self.ball_y > self.paddle_bot_y + self.paddle_height // 2:
             if self.paddle_bot_y < self.HEIGHT - self.paddle_height:
                 self.paddle_bot_y += self.paddle_speed
@@ -136,20 +191,33 @@ class Pong:
         #Score
         self.screen.blit(self.text_score_player_1, self.textRect_1)
         self.screen.blit(self.text_score_player_2, self.textRect_2)
+        self.tracer.draw_hud(self.screen)
 
         pg.display.flip()
-        self.clock.tick(60)
+        self.tracer.presented()
+        self.clock.tick(self.fps)
 
     def run(self):
         while True:
             self.check_event()
-            self.control()
+            if self.control_type == "yolo":
+                self.control()
+            else:
+                self.control_keyboard()
             self.update_ball()
             self.bot_movement()
             self.render()
 
     def close(self):
-        self.cap.release()
+        if self.vision is not None:
+            stats = self.vision.stats()
+            print(f"Caméra : {stats['capture_fps']:.1f} FPS | YOLO : {stats['inference_fps']:.1f} FPS | "
+                  f"{stats['dropped']}/{stats['captured']} images ignorées")
+            print(self.scheduler.format_stats())
+            self.vision.stop()
+        path = self.tracer.dump()
+        if path is not None:
+            print(f"Traces de latence écrites dans {path}")
         pg.quit()
         sys.exit()
 
@@ -2,13 +2,18 @@ import gym
 import pygame as pg
 import numpy as np
 import sys
+import os
+import math
 from gym import spaces
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asset_registry import registry
+
 class PongEnv(gym.Env):
-    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, grid=True):
+    def __init__(self, WIDTH: int = 1280, HEIGHT: int = 720, grid=True, render_mode=None,
+                 frame_skip: int = 1, analytic: bool = False,
+                 obs_type: str = "vector", frame_stack: int = 4, pixel_stride: int = 8, fps: int = 60):
         super(PongEnv, self).__init__()
-        pg.init()
-        self.clock = pg.time.Clock()
         self.WIDTH = WIDTH
         self.HEIGHT = HEIGHT
 
@@ -18,37 +23,81 @@ class PongEnv(gym.Env):
         self.paddle_speed = 10  # Vitesse de déplacement des raquettes
 
         self.grid = grid
-        self.screen = pg.display.set_mode((self.WIDTH, self.HEIGHT))
+        # render_mode=None : aucune fenêtre, aucun asset (entraînement sans écran)
+        # render_mode="human" : fenêtre ouverte, assets chargés au premier render()
+        self.render_mode = render_mode
+        self.fps = fps  # limite d'images par seconde en mode "human", 0 = sans limite
+        self.assets_loaded = False
+        if self.render_mode == "human":
+            pg.init()
+            self.clock = pg.time.Clock()
+            self.screen = pg.display.set_mode((self.WIDTH, self.HEIGHT))
         self.score_player_1 = 0
         self.score_player_2 = 0
 
+        # frame_skip : nombre de ticks simulés par step() avec la même action
+        # analytic : saute directement au prochain événement (rebond, raquette, but)
+        # au lieu de simuler chaque tick, avec exactement le même résultat
+        self.frame_skip = frame_skip
+        self.analytic = analytic
+        # Ticks restants jusqu'au prochain événement de la balle, gardé d'un step() à l'autre ;
+        # None : à recalculer (après un tick d'événement ou un reset)
+        self.event_in = None
+
         # Définition des actions : 0 = rien, 1 = haut et 2 = bas
         self.action_space = spaces.Discrete(3)
-        self.observation_space = spaces.Box(
-            low = np.array([0, 0, -7, -7, 0, 0]),
-            high = np.array([self.WIDTH, self.HEIGHT, 7, 7, self.WIDTH, self.HEIGHT], dtype=np.float32),
-        )
+
+        # obs_type="vector" : 6 valeurs normalisées
+        # obs_type="pixels" : les frame_stack dernières images en niveaux de gris,
+        # sous-échantillonnées d'un facteur pixel_stride, de la plus ancienne à la plus récente
+        self.obs_type = obs_type
+        if self.obs_type == "pixels":
+            self._init_pixels(frame_stack, pixel_stride)
+        else:
+            self.observation_space = spaces.Box(
+                low = np.array([0, 0, -7, -7, 0, 0]),
+                high = np.array([self.WIDTH, self.HEIGHT, 7, 7, self.WIDTH, self.HEIGHT], dtype=np.float32),
+            )
         self.reset()
 
+    def _init_pixels(self, frame_stack, pixel_stride):
+        """Prépare le rendu hors écran et la pile d'images préallouée."""
+        self.frame_stack = frame_stack
+        self.pixel_stride = pixel_stride
+
+        # Surface 8 bits avec une palette de gris : la valeur d'un pixel est directement sa luminance,
+        # sans fenêtre ni conversion de couleur
+        self.canvas = pg.Surface((self.WIDTH, self.HEIGHT), 0, 8)
+        self.canvas.set_palette([(i, i, i) for i in range(256)])
+        self.canvas.fill(0)
+        self.dirty_rects = []
+
+        height = -(-self.HEIGHT // pixel_stride)
+        width = -(-self.WIDTH // pixel_stride)
+        self.frames = np.zeros((frame_stack, height, width), dtype=np.uint8)
+        self.frame_head = 0
+        self.observation_space = spaces.Box(low=0, high=255, shape=self.frames.shape, dtype=np.uint8)
+
     def load_asset(self):
         if self.grid:
-            self.background = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Background  Grid.png")
+            self.background = registry.image("pong/Neon Pong Assets/Neon Pong/images/Background  Grid.png")
         else:
-            self.background = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Background Empty.png")
+            self.background = registry.image("pong/Neon Pong Assets/Neon Pong/images/Background Empty.png")
 
-        self.paddle_left_img = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Paddle_1.png")
-        self.paddle_right_img = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Paddle_2.png")
-        self.ball_img = pg.image.load("pong/Neon Pong Assets/Neon Pong/images/Ball.png")
+        self.paddle_left_img = registry.image("pong/Neon Pong Assets/Neon Pong/images/Paddle_1.png", alpha=True)
+        self.paddle_right_img = registry.image("pong/Neon Pong Assets/Neon Pong/images/Paddle_2.png", alpha=True)
+        self.ball_img = registry.image("pong/Neon Pong Assets/Neon Pong/images/Ball.png", alpha=True)
 
-        self.police_asset = pg.font.Font("pong/Neon Pong Assets/Micro5-Regular.ttf", 50)
+        self.police_asset = registry.font("pong/Neon Pong Assets/Micro5-Regular.ttf", 50)
+        self.assets_loaded = True
 
     def reset(self):
-        self.load_asset()
-        self.update_score()
         self.ball_x = self.WIDTH // 2
         self.ball_y = self.HEIGHT // 2
-        self.ball_dx = np.random.choice([-7, 7])
-        self.ball_dy = np.random.choice([-7, 7])
+        # Entiers Python : l'arithmétique des ticks est bien plus rapide que sur des scalaires NumPy
+        self.ball_dx = int(np.random.choice([-7, 7]))
+        self.ball_dy = int(np.random.choice([-7, 7]))
+        self.event_in = None
 
         self.paddle_player_y = self.HEIGHT // 2 - self.paddle_height // 2
         self.paddle_bot_y = self.HEIGHT // 2 - self.paddle_height // 2
@@ -56,10 +105,43 @@ class PongEnv(gym.Env):
         self.paddle_player_x = 50
         self.paddle_bot_x = self.WIDTH - self.paddle_width - 50
 
+        if self.obs_type == "pixels":
+            # La pile repart de l'image initiale répétée
+            self._pixel_obs()
+            self.frames[:] = self.frames[self.frame_head]
+            return self.frames.copy()
+
         return self._get_obs()
 
+    def _draw_canvas(self):
+        """Dessine l'état courant dans la surface hors écran (pas de clock.tick, pas de flip).
+
+        Seules les zones dessinées à l'image précédente sont effacées, pas toute la surface.
+        """
+        for rect in self.dirty_rects:
+            self.canvas.fill(0, rect)
+        self.dirty_rects = [
+            pg.draw.rect(self.canvas, 255,
+                         (self.paddle_player_x, self.paddle_player_y, self.paddle_width, self.paddle_height)),
+            pg.draw.rect(self.canvas, 255,
+                         (self.paddle_bot_x, self.paddle_bot_y, self.paddle_width, self.paddle_height)),
+            pg.draw.circle(self.canvas, 255, (int(self.ball_x), int(self.ball_y)), self.ball_radius),
+        ]
+
+    def _pixel_obs(self):
+        """Dessine l'image courante et l'empile ; la copie vers la pile lit la surface via une vue surfarray."""
+        self._draw_canvas()
+        self.frame_head = (self.frame_head + 1) % self.frame_stack
+        view = pg.surfarray.pixels2d(self.canvas)  # (WIDTH, HEIGHT), verrouille la surface
+        np.copyto(self.frames[self.frame_head], view[::self.pixel_stride, ::self.pixel_stride].T)
+        del view  # déverrouille la surface pour le prochain dessin
+        order = (self.frame_head + 1 + np.arange(self.frame_stack)) % self.frame_stack
+        return self.frames[order]
+
     def _get_obs(self):
-        
+        if self.obs_type == "pixels":
+            return self._pixel_obs()
+
         obs_elements = [
             self.ball_x / self.WIDTH, 
             self.ball_y / self.HEIGHT, 
@@ -74,6 +156,8 @@ class PongEnv(gym.Env):
 
     def update_score(self):
         """Met à jour les images de score pour affichage"""
+        if not self.assets_loaded:
+            return
         self.text_score_player_1 = self.police_asset.render(str(self.score_player_1), True, (255, 255, 255))
         self.text_score_player_2 = self.police_asset.render(str(self.score_player_2), True, (255, 255, 255))
 
@@ -81,7 +165,20 @@ class PongEnv(gym.Env):
         self.textRect_2 = self.text_score_player_2.get_rect(center=(self.WIDTH // 2 + 40, 50))
 
     def step(self, action):
-        """Exécute une action"""
+        """Exécute une action, répétée pendant frame_skip ticks"""
+        if self.analytic:
+            reward, done, ticks = self._advance(action, self.frame_skip)
+        else:
+            reward, done, ticks = 0, False, 0
+            while ticks < self.frame_skip and not done:
+                tick_reward, done = self._tick(action)
+                reward += tick_reward
+                ticks += 1
+
+        return self._get_obs(), reward, done, {"ticks": ticks}
+
+    def _tick(self, action):
+        """Simule un tick de jeu ; renvoie (reward, done)"""
         reward = 0
         done = False
 
@@ -132,7 +229,118 @@ class PongEnv(gym.Env):
             done = True
             
         #reward -= 0.01
-        return self._get_obs(), reward, done, {}
+        return reward, done
+
+    def _advance(self, action, n_ticks):
+        """Simule n_ticks ticks en sautant d'un événement à l'autre.
+
+        Les événements ne dépendent que de la balle (les raquettes ont un x fixe) : le nombre
+        de ticks jusqu'au prochain est gardé entre deux step() et décompté pendant les sauts ;
+        il n'est recalculé qu'après un tick d'événement (rebond, raquette) ou un reset.
+        """
+        reward, done, ticks = 0, False, 0
+        while ticks < n_ticks and not done:
+            if self.event_in is None:
+                self.event_in = self._ticks_to_event()
+            # Ticks sans aucun événement : on les applique en une fois
+            quiet = self.event_in - 1
+            if quiet > n_ticks - ticks:
+                quiet = n_ticks - ticks
+            if quiet > 0:
+                self._jump(action, quiet)
+                ticks += quiet
+                self.event_in -= quiet
+            # Le tick de l'événement est simulé normalement
+            if ticks < n_ticks:
+                tick_reward, done = self._tick(action)
+                reward += tick_reward
+                ticks += 1
+                self.event_in = None
+        return reward, done, ticks
+
+    def _ticks_to_event(self):
+        """Nombre de ticks jusqu'au prochain tick où un test de _tick() peut se déclencher."""
+        r = self.ball_radius
+        first_tick_in = self._first_tick_in
+        x, dx, y, dy = self.ball_x, self.ball_dx, self.ball_y, self.ball_dy
+        first = first_tick_in(x, dx, self.paddle_player_x + r, self.paddle_player_x + self.paddle_width + r)  # raquette agent
+        j = first_tick_in(x, dx, self.paddle_bot_x - r, self.paddle_bot_x + self.paddle_width - r)  # raquette bot
+        if j < first:
+            first = j
+        # Buts puis bords haut et bas, testés dans les deux sens (double rebond juste après un rebond)
+        for j in (first_tick_in(x, dx, -math.inf, 0), first_tick_in(x, dx, self.WIDTH, math.inf),
+                  first_tick_in(y, dy, -math.inf, r - 10), first_tick_in(y, dy, self.HEIGHT - 10 - r, math.inf)):
+            if j < first:
+                first = j
+        return first
+
+    @staticmethod
+    def _first_tick_in(pos, vel, lo, hi):
+        """Plus petit j >= 1 tel que lo <= pos + vel * j <= hi (inf si jamais)."""
+        if vel == 0:
+            return 1 if lo <= pos <= hi else math.inf
+        if vel < 0:
+            pos, vel, lo, hi = -pos, -vel, -hi, -lo
+        j = 1 if lo == -math.inf else max(1, -((pos - lo) // vel))
+        return j if pos + vel * j <= hi else math.inf
+
+    def _jump(self, action, n):
+        """Avance l'état de n ticks d'un coup ; suppose qu'aucun événement n'a lieu pendant ces ticks."""
+        speed = self.paddle_speed
+
+        # Raquette agent : elle avance jusqu'à sa butée puis s'arrête
+        if action == 1 and self.paddle_player_y > -10:
+            moves = -((-10 - self.paddle_player_y) // speed)
+            self.paddle_player_y -= speed * min(n, moves)
+        elif action == 2 and self.paddle_player_y < self.HEIGHT - self.paddle_height - 10:
+            moves = -((self.paddle_player_y - (self.HEIGHT - self.paddle_height - 10)) // speed)
+            self.paddle_player_y += speed * min(n, moves)
+
+        # Raquette bot : on suit l'écart entre la balle et le centre de la raquette
+        offset = int(self.ball_y - (self.paddle_bot_y + self.paddle_height // 2))
+        offset = self._bot_offset(offset, int(self.ball_dy), n)
+
+        self.ball_x += self.ball_dx * n
+        self.ball_y += self.ball_dy * n
+        self.paddle_bot_y = self.ball_y - offset - self.paddle_height // 2
+
+    def _bot_offset(self, offset, dy, n):
+        """Écart balle/centre de la raquette bot après n ticks.
+
+        À chaque tick : offset -> offset - speed * signe(offset) + dy. Tant que le signe
+        ne change pas l'évolution est linéaire ; ensuite l'écart oscille dans un petit
+        intervalle et la suite devient périodique, ce qui permet de sauter n ticks d'un coup.
+        """
+        speed = self.paddle_speed
+        sign = (offset > 0) - (offset < 0)
+        closing = speed - sign * dy
+        if sign != 0 and closing > 0:
+            # Phase d'approche : l'écart diminue de `closing` par tick
+            moves = -(-(sign * offset) // closing)
+            if n <= moves:
+                return offset - sign * closing * n
+            offset -= sign * closing * moves
+            n -= moves
+
+        # Phase d'oscillation : sauts courts (frame_skip usuels) simulés directement,
+        # détection du cycle seulement pour les longs sauts
+        if n <= 32:
+            for _ in range(n):
+                offset += dy - speed if offset > 0 else (dy + speed if offset < 0 else dy)
+            return offset
+        seen = {}
+        states = []
+        while n > 0:
+            if offset in seen:
+                start = seen[offset]
+                period = len(states) - start
+                return states[start + n % period]
+            seen[offset] = len(states)
+            states.append(offset)
+            sign = (offset > 0) - (offset < 0)
+            offset = offset - speed * sign + dy
+            n -= 1
+        return offset
         
 
     def control(self):
@@ -193,6 +401,12 @@ class PongEnv(gym.Env):
         
     def render(self):
         """Affiche le jeu avec Pygame."""
+        if self.render_mode != "human":
+            return
+        if not self.assets_loaded:
+            self.load_asset()
+            self.update_score()
+
         self.screen.fill((0, 0, 0))
         self.screen.blit(self.background, (0, 0))
 
@@ -210,7 +424,7 @@ class PongEnv(gym.Env):
         self.screen.blit(self.text_score_player_2, self.textRect_2)
 
         pg.display.flip()
-        self.clock.tick(60)
+        self.clock.tick(self.fps)
 
     def run(self):
         """Boucle principale du jeu."""
@@ -224,9 +438,10 @@ class PongEnv(gym.Env):
 
     def close(self):
         """Ferme la fenêtre."""
-        pg.quit()
+        if self.render_mode == "human":
+            pg.quit()
         sys.exit()
 
 if __name__ == '__main__':
-    pong = PongEnv(grid=False)
+    pong = PongEnv(grid=False, render_mode="human")
     pong.run()
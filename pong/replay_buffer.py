@@ -0,0 +1,206 @@
+import os
+import numpy as np
+
+
+class SumTree:
+    """Arbre de sommes stocké dans un tableau : mise à jour et recherche en O(log n).
+
+    Les feuilles (priorités) sont à partir de l'indice `size`, la racine à l'indice 1.
+    Toutes les opérations sont vectorisées sur un lot d'indices.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.size = 1 << max(capacity - 1, 1).bit_length()
+        self.tree = np.zeros(2 * self.size, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        """Écrit les priorités des feuilles puis remonte les sommes jusqu'à la racine."""
+        nodes = np.asarray(indices, dtype=np.int64) + self.size
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while True:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        """Descend l'arbre pour chaque valeur et renvoie l'indice de la feuille correspondante."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.size:
+            left = 2 * nodes
+            go_right = values > self.tree[left]
+            values -= self.tree[left] * go_right
+            nodes = left + go_right
+        return np.minimum(nodes - self.size, self.capacity - 1)
+
+    def rebuild(self):
+        """Recalcule tous les nœuds internes à partir des feuilles, niveau par niveau."""
+        start = self.size
+        while start > 1:
+            nodes = np.arange(start // 2, start)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            start //= 2
+
+
+class ReplayBuffer:
+    """Mémoire de rejeu circulaire dans des tableaux NumPy préalloués.
+
+    Avec prioritized=True, les transitions sont tirées proportionnellement à
+    leur priorité (|erreur TD| + eps) ** alpha, stockée dans un SumTree.
+
+    Avec path, les tableaux sont des fichiers .npy mappés en mémoire dans ce dossier :
+    le contenu survit à un redémarrage et se recharge avec load_state_dict().
+    """
+
+    def __init__(self, capacity, state_dim, prioritized=False, alpha=0.6, eps=1e-6, seed=None, path=None):
+        self.capacity = capacity
+        self.state_dim = state_dim
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.eps = eps
+        self.path = path
+        self.rng = np.random.default_rng(seed)
+
+        self.states = self._array("states", (capacity, state_dim), np.float32)
+        self.next_states = self._array("next_states", (capacity, state_dim), np.float32)
+        self.actions = self._array("actions", (capacity,), np.int64)
+        self.rewards = self._array("rewards", (capacity,), np.float32)
+        self.dones = self._array("dones", (capacity,), np.bool_)
+
+        self.pos = 0
+        self.size = 0
+
+        if self.prioritized:
+            self.tree = SumTree(capacity)
+            # Priorités d'une exécution précédente : mises de côté jusqu'à load_state_dict(),
+            # l'arbre repart vide comme pos et size
+            self.saved_priorities = None
+            if self.path is not None:
+                self.tree.tree = self._array("priorities", self.tree.tree.shape, np.float64)
+                leaves = self.tree.tree[self.tree.size:self.tree.size + capacity]
+                if leaves.any():
+                    self.saved_priorities = leaves.copy()
+                self.tree.tree[:] = 0
+            self.max_priority = 1.0
+
+    def _array(self, name, shape, dtype):
+        """Tableau en RAM, ou fichier .npy mappé en mémoire (réouvert s'il existe déjà)."""
+        if self.path is None:
+            return np.zeros(shape, dtype=dtype)
+        os.makedirs(self.path, exist_ok=True)
+        filename = os.path.join(self.path, name + ".npy")
+        if os.path.exists(filename):
+            array = np.lib.format.open_memmap(filename, mode="r+")
+            if array.shape == shape and array.dtype == dtype:
+                return array
+            del array
+        return np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+
+    def state_dict(self):
+        """Position d'écriture et taille : les données elles-mêmes restent dans les fichiers."""
+        state = {"pos": self.pos, "size": self.size, "rng": self.rng.bit_generator.state}
+        if self.prioritized:
+            state["max_priority"] = self.max_priority
+        return state
+
+    def load_state_dict(self, state):
+        self.pos = state["pos"]
+        self.size = state["size"]
+        self.rng.bit_generator.state = state["rng"]
+        if self.prioritized:
+            self.max_priority = state["max_priority"]
+            # Seules les feuilles des transitions restaurées gardent leur priorité
+            leaves = self.tree.tree[self.tree.size:]
+            leaves[:] = 0
+            if self.saved_priorities is not None:
+                leaves[:self.size] = self.saved_priorities[:self.size]
+                self.saved_priorities = None
+            self.tree.rebuild()
+
+    def flush(self):
+        """Force l'écriture sur disque des tableaux mappés en mémoire."""
+        if self.path is None:
+            return
+        arrays = [self.states, self.next_states, self.actions, self.rewards, self.dones]
+        if self.prioritized:
+            arrays.append(self.tree.tree)
+        for array in arrays:
+            array.flush()
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        """Ajoute une transition en écrasant la plus ancienne si la mémoire est pleine."""
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.pos = (self.pos + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        if self.prioritized:
+            self.tree.update([i], self.max_priority)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Ajoute un lot de transitions (par exemple un pas de VecPongEnv) en une seule écriture."""
+        n = len(actions)
+        if n > self.capacity:
+            states, actions, rewards, next_states, dones = (
+                x[-self.capacity:] for x in (states, actions, rewards, next_states, dones))
+            n = self.capacity
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        if self.prioritized:
+            self.tree.update(idx, self.max_priority)
+
+    def sample(self, batch_size, beta=0.4):
+        """Tire un lot et renvoie (states, actions, rewards, next_states, dones, indices, weights).
+
+        En mode uniforme les poids valent 1 ; en mode prioritaire ce sont les poids
+        d'importance normalisés (N * P(i)) ** -beta / max.
+        """
+        if self.prioritized:
+            # Tirage stratifié : une valeur par segment de même masse
+            segment = self.tree.total() / batch_size
+            values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+            indices = np.minimum(self.tree.find(values), self.size - 1)
+            probs = self.tree.tree[indices + self.tree.size] / self.tree.total()
+            weights = (self.size * probs) ** -beta
+            weights = (weights / weights.max()).astype(np.float32)
+        else:
+            indices = self.rng.integers(0, self.size, size=batch_size)
+            weights = np.ones(batch_size, dtype=np.float32)
+
+        return (
+            self.states[indices],
+            self.actions[indices],
+            self.rewards[indices],
+            self.next_states[indices],
+            self.dones[indices],
+            indices,
+            weights,
+        )
+
+    def update_priorities(self, indices, td_errors):
+        """Met à jour les priorités des transitions échantillonnées à partir de leurs erreurs TD."""
+        if not self.prioritized:
+            return
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
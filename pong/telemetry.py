@@ -0,0 +1,152 @@
+import os
+import csv
+import json
+import time
+import cProfile
+import pstats
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class Telemetry:
+    """Compteurs et chronomètres glissants pour la boucle d'entraînement.
+
+    timer(name) mesure une section (fenêtre des `window` dernières durées),
+    count(name) incrémente un compteur dont on rapporte le débit par seconde.
+    report() calcule les percentiles et débits depuis le rapport précédent et,
+    si path est défini, ajoute une ligne au fichier (.jsonl ou .csv).
+    """
+
+    def __init__(self, path=None, window=1000, sync=None):
+        self.path = path
+        self.sync = sync  # ex. torch.cuda.synchronize pour chronométrer le GPU
+        self.timings = defaultdict(lambda: deque(maxlen=window))
+        self.counters = defaultdict(int)
+        self._last_counters = {}
+        self._last_report = time.perf_counter()
+        self._csv_fields = None
+
+    @contextmanager
+    def timer(self, name):
+        if self.sync is not None:
+            self.sync()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.sync is not None:
+                self.sync()
+            self.timings[name].append(time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def summary(self):
+        now = time.perf_counter()
+        elapsed = max(now - self._last_report, 1e-9)
+        row = {"time": time.time(), "elapsed_s": round(elapsed, 3)}
+        for name, value in self.counters.items():
+            row[f"{name}_total"] = value
+            row[f"{name}_per_s"] = round((value - self._last_counters.get(name, 0)) / elapsed, 1)
+        for name, durations in self.timings.items():
+            if not durations:
+                continue
+            ordered = sorted(durations)
+            for q in (50, 95, 99):
+                index = min(len(ordered) - 1, int(len(ordered) * q / 100))
+                row[f"{name}_p{q}_ms"] = round(ordered[index] * 1000, 4)
+            row[f"{name}_mean_ms"] = round(sum(ordered) / len(ordered) * 1000, 4)
+        return row
+
+    def report(self, **extra):
+        """Renvoie le résumé courant, l'écrit dans le fichier de métriques et repart de zéro pour les débits."""
+        row = self.summary()
+        row.update(extra)
+        if self.path is not None:
+            self._write(row)
+        self._last_counters = dict(self.counters)
+        self._last_report = time.perf_counter()
+        return row
+
+    def _write(self, row):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.path.endswith(".csv"):
+            # Colonnes fixées par le premier rapport
+            new_file = self._csv_fields is None and not os.path.exists(self.path)
+            if self._csv_fields is None:
+                self._csv_fields = list(row)
+            with open(self.path, "a", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=self._csv_fields, extrasaction="ignore")
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(row)
+        else:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(row) + "\n")
+
+    def format(self, row, names=("env_step", "act", "sample", "forward", "backward", "target_sync")):
+        """Ligne courte pour la console."""
+        parts = []
+        if "env_steps_per_s" in row:
+            parts.append(f"{row['env_steps_per_s']:.0f} steps/s")
+        if "updates_per_s" in row:
+            parts.append(f"{row['updates_per_s']:.0f} updates/s")
+        for name in names:
+            if f"{name}_p50_ms" in row:
+                parts.append(f"{name} p50 {row[f'{name}_p50_ms']:.3f}ms p99 {row[f'{name}_p99_ms']:.3f}ms")
+        return " | ".join(parts)
+
+
+class ProfileWindow:
+    """Profile une fenêtre de n_steps pas à partir du pas start, avec cProfile ou torch.profiler."""
+
+    def __init__(self, kind, start, n_steps, output="profile"):
+        if kind not in ("cprofile", "torch"):
+            raise ValueError(f"Profiler inconnu : {kind}")
+        self.kind = kind
+        self.start = start
+        self.stop = start + n_steps
+        self.output = output
+        self.profiler = None
+        self.done = False
+
+    def step(self, step_count):
+        """À appeler à chaque pas d'environnement."""
+        if self.done:
+            return
+        if self.profiler is None:
+            if step_count >= self.start:
+                self._start()
+                self.stop = step_count + (self.stop - self.start)
+        else:
+            if self.kind == "torch":
+                self.profiler.step()
+            if step_count >= self.stop:
+                self._stop()
+
+    def _start(self):
+        if self.kind == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            import torch.profiler
+            self.profiler = torch.profiler.profile(
+                activities=[torch.profiler.ProfilerActivity.CPU], record_shapes=True)
+            self.profiler.__enter__()
+
+    def _stop(self):
+        if self.kind == "cprofile":
+            path = self.output + ".prof"
+            self.profiler.disable()
+            self.profiler.dump_stats(path)
+            pstats.Stats(self.profiler).sort_stats("cumulative").print_stats(20)
+        else:
+            path = self.output + ".json"
+            self.profiler.__exit__(None, None, None)
+            self.profiler.export_chrome_trace(path)
+            print(self.profiler.key_averages().table(sort_by="self_cpu_time_total", row_limit=20))
+        print(f"Profil écrit dans {path}")
+        self.profiler = None
+        self.done = True
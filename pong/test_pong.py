@@ -1,23 +1,19 @@
-import torch
-import numpy as np
+import argparse
 from pong_env import PongEnv
-from train_pong import DQN
+from inference import PolicyRunner
 
 def select_action(state):
-    state = torch.FloatTensor(state).unsqueeze(0)
-    with torch.no_grad():
-        q_values = model(state)
-    return torch.argmax(q_values).item()
+    return runner.act(state)
 
 
 if __name__ == '__main__':
-    env = PongEnv()
-    state_dim = len(env.reset())
-    n_actions = env.action_space.n
+    parser = argparse.ArgumentParser(description="Fait jouer l'agent entraîné")
+    parser.add_argument("--model", default="pong_best.pth",
+                        help="poids eager (.pth) ou modèle exporté par inference.py (.pt)")
+    args = parser.parse_args()
 
-    model = DQN(state_dim, n_actions)
-    model.load_state_dict(torch.load("pong_best.pth"))
-    model.eval()
+    env = PongEnv(render_mode="human")
+    runner = PolicyRunner.load(args.model)
 
     state = env.reset()
     done = False
@@ -1,10 +1,16 @@
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import os
 import random
+import argparse
 import numpy as np
-from collections import deque
+from contextlib import nullcontext
 from pong_env import PongEnv  # Assurez-vous d'utiliser la version corrigée
+from replay_buffer import ReplayBuffer
+from evaluation import evaluate_policy
+from checkpoint import Checkpointer, load_checkpoint, rng_state, set_rng_state
+from telemetry import Telemetry, ProfileWindow
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -18,6 +24,15 @@ EPSILON_DECAY = 0.9999
 TARGET_UPDATE_FREQ = 5_000
 REPLAY_MEMORY_SIZE = 500_000
 EVAL_FREQ = 10
+EVAL_EPISODES = 100
+EVAL_SEED = 0
+CHECKPOINT_FREQ = 50  # épisodes entre deux checkpoints complets
+
+# Replay prioritaire (désactivé par défaut)
+PRIORITIZED_REPLAY = False
+PER_ALPHA = 0.6
+PER_BETA_START = 0.4
+PER_BETA_STEPS = 1_000_000
 
 class DQN(nn.Module):
     def __init__(self, input_dim, output_dim):
@@ -41,25 +56,72 @@ def preprocess_state(state):
 
 def epsilon_greedy(state, epsilon, net):
     if random.random() < epsilon:
-        return random.randint(0, n_actions-1)
+        return random.randint(0, net.advantage.out_features - 1)
     else:
         state_tensor = torch.FloatTensor(state).unsqueeze(0).to(device)
         with torch.no_grad():
             return net(state_tensor).argmax().item()
 
-def evaluate_agent(net, env, n_episodes=5):
-    total_reward = 0
-    for _ in range(n_episodes):
-        state = preprocess_state(env.reset())
-        done = False
-        while not done:
-            action = epsilon_greedy(state, 0.0, net)
-            next_state, reward, done, _ = env.step(action)
-            state = preprocess_state(next_state)
-            total_reward += reward
-    return total_reward / n_episodes
+def optimize_model(policy_net, target_net, optimizer, batch, telemetry=None):
+    """Une descente de gradient sur un lot du replay buffer ; renvoie les erreurs TD."""
+    timer = telemetry.timer if telemetry is not None else (lambda name: nullcontext())
+    states, actions, rewards, next_states, dones, _, weights = batch
+
+    states = torch.from_numpy(states).to(device)
+    next_states = torch.from_numpy(next_states).to(device)
+    actions = torch.from_numpy(actions).to(device)
+    rewards = torch.from_numpy(rewards).to(device)
+    dones = torch.from_numpy(dones).to(device)
+    weights = torch.from_numpy(weights).to(device)
+
+    with timer("forward"):
+        current_q = policy_net(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+
+        with torch.no_grad():
+            next_q = target_net(next_states).max(1)[0]
+            target_q = rewards + (GAMMA * next_q * ~dones)
+
+        # Poids d'importance : tous à 1 sans replay prioritaire
+        loss = (weights * nn.SmoothL1Loss(reduction="none")(current_q, target_q)).mean()
+
+    with timer("backward"):
+        optimizer.zero_grad()
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(policy_net.parameters(), 1.0)
+        optimizer.step()
+
+    return (target_q - current_q).detach().cpu().numpy()
+
+def evaluate_agent(net, n_episodes=EVAL_EPISODES):
+    """Évalue la politique sur des épisodes à graines fixes, sans toucher à l'env d'entraînement"""
+    return evaluate_policy(net, n_episodes=n_episodes, seed=EVAL_SEED)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Entraînement DQN sur PongEnv")
+    parser.add_argument("--actors", type=int, default=0,
+                        help="nombre de processus acteurs (0 = tout dans un seul processus)")
+    parser.add_argument("--checkpoint-dir", default="checkpoints",
+                        help="dossier des checkpoints complets")
+    parser.add_argument("--resume", action="store_true",
+                        help="reprend depuis le dernier checkpoint du dossier")
+    parser.add_argument("--replay-dir", default=None,
+                        help="stocke le replay buffer dans des fichiers mappés en mémoire de ce dossier")
+    parser.add_argument("--record", default=None,
+                        help="enregistre aussi toutes les transitions dans ce dossier (voir dataset.py)")
+    parser.add_argument("--metrics", default=None,
+                        help="fichier de métriques de débit (.jsonl ou .csv), une ligne tous les EVAL_FREQ épisodes")
+    parser.add_argument("--profile", choices=["cprofile", "torch"], default=None,
+                        help="profile une fenêtre de pas avec cProfile ou torch.profiler")
+    parser.add_argument("--profile-start", type=int, default=10_000, help="premier pas profilé")
+    parser.add_argument("--profile-steps", type=int, default=500, help="nombre de pas profilés")
+    parser.add_argument("--profile-out", default="profile", help="fichier de sortie du profil (sans extension)")
+    args = parser.parse_args()
+
+    if args.actors > 0:
+        from actor_learner import train_distributed
+        train_distributed(args.actors)
+        raise SystemExit
+
     env = PongEnv()
     n_actions = env.action_space.n
     state_dim = len(preprocess_state(env.reset()))
@@ -70,63 +132,108 @@ if __name__ == '__main__':
     target_net.eval()
 
     optimizer = optim.Adam(policy_net.parameters(), lr=LEARNING_RATE)
-    memory = deque(maxlen=REPLAY_MEMORY_SIZE)
+    memory = ReplayBuffer(REPLAY_MEMORY_SIZE, state_dim, prioritized=PRIORITIZED_REPLAY, alpha=PER_ALPHA,
+                          path=args.replay_dir)
     
+    recorder = None
+    if args.record is not None:
+        from dataset import TrajectoryRecorder
+        recorder = TrajectoryRecorder(args.record, state_dim)
+
     epsilon = EPSILON_START
     best_reward = -float('inf')
     step_count = 0
-
-    for episode in range(1, 1001):
+    start_episode = 1
+
+    telemetry = Telemetry(args.metrics, sync=torch.cuda.synchronize if device.type == "cuda" else None)
+    profiler = ProfileWindow(args.profile, args.profile_start, args.profile_steps, args.profile_out) if args.profile else None
+
+    checkpointer = Checkpointer()
+    checkpoint_path = os.path.join(args.checkpoint_dir, "checkpoint.pth")
+    if args.resume and os.path.exists(checkpoint_path):
+        checkpoint = load_checkpoint(checkpoint_path, map_location=device)
+        policy_net.load_state_dict(checkpoint["policy_net"])
+        target_net.load_state_dict(checkpoint["target_net"])
+        optimizer.load_state_dict(checkpoint["optimizer"])
+        epsilon = checkpoint["epsilon"]
+        step_count = checkpoint["step_count"]
+        best_reward = checkpoint["best_reward"]
+        start_episode = checkpoint["episode"] + 1
+        set_rng_state(checkpoint["rng"])
+        # Sans --replay-dir le contenu du buffer n'a pas été conservé
+        if args.replay_dir is not None and checkpoint["replay"] is not None:
+            memory.load_state_dict(checkpoint["replay"])
+        print(f"Reprise à l'épisode {start_episode} ({step_count} steps, {len(memory)} transitions)")
+
+    for episode in range(start_episode, 1001):
         state = preprocess_state(env.reset())
         done = False
         total_reward = 0
         
         while not done:
-            action = epsilon_greedy(state, epsilon, policy_net)
-            next_state, reward, done, _ = env.step(action)
-            next_state = preprocess_state(next_state)
+            with telemetry.timer("act"):
+                action = epsilon_greedy(state, epsilon, policy_net)
+            with telemetry.timer("env_step"):
+                next_state, reward, done, _ = env.step(action)
+                next_state = preprocess_state(next_state)
             
-            memory.append((state, action, reward, next_state, done))
+            memory.add(state, action, reward, next_state, done)
+            if recorder is not None:
+                recorder.add(state, action, reward, next_state, done)
             state = next_state
             total_reward += reward
             step_count += 1
+            telemetry.count("env_steps")
             epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
 
             # Entraînement
             if len(memory) >= BATCH_SIZE:
-                batch = random.sample(memory, BATCH_SIZE)
-                states, actions, rewards, next_states, dones = zip(*batch)
-                
-                states = torch.FloatTensor(np.array(states)).to(device)
-                next_states = torch.FloatTensor(np.array(next_states)).to(device)
-                actions = torch.LongTensor(actions).to(device)
-                rewards = torch.FloatTensor(rewards).to(device)
-                dones = torch.BoolTensor(dones).to(device)
-
-                current_q = policy_net(states).gather(1, actions.unsqueeze(1))
-                
-                with torch.no_grad():
-                    next_q = target_net(next_states).max(1)[0]
-                    target_q = rewards + (GAMMA * next_q * ~dones)
-
-                loss = nn.SmoothL1Loss()(current_q.squeeze(), target_q)
-                optimizer.zero_grad()
-                loss.backward()
-                torch.nn.utils.clip_grad_norm_(policy_net.parameters(), 1.0)
-                optimizer.step()
+                beta = min(1.0, PER_BETA_START + step_count * (1.0 - PER_BETA_START) / PER_BETA_STEPS)
+                with telemetry.timer("sample"):
+                    batch = memory.sample(BATCH_SIZE, beta)
+                td_errors = optimize_model(policy_net, target_net, optimizer, batch, telemetry)
+                memory.update_priorities(batch[5], td_errors)
+                telemetry.count("updates")
 
             # Mise à jour du réseau cible
             if step_count % TARGET_UPDATE_FREQ == 0:
-                target_net.load_state_dict(policy_net.state_dict())
+                with telemetry.timer("target_sync"):
+                    target_net.load_state_dict(policy_net.state_dict())
+
+            if profiler is not None:
+                profiler.step(step_count)
 
         # Évaluation et logging
         if episode % EVAL_FREQ == 0:
-            eval_reward = evaluate_agent(policy_net, env)
-            print(f"Episode {episode} | Train Reward: {total_reward:.1f} | Eval Reward: {eval_reward:.1f} | Epsilon: {epsilon:.3f}")
+            with telemetry.timer("evaluate"):
+                stats = evaluate_agent(policy_net)
+            eval_reward = stats["reward"].mean()
+            print(f"Episode {episode} | Train Reward: {total_reward:.1f} | Eval Reward: {eval_reward:.1f} "
+                  f"| Eval Length: {stats['length'].mean():.0f} | Eval Hits: {stats['hits'].mean():.1f} | Epsilon: {epsilon:.3f}")
+            row = telemetry.report(episode=episode, step=step_count, epsilon=epsilon, eval_reward=float(eval_reward))
+            print(telemetry.format(row))
             
             if eval_reward > best_reward:
                 print("Saved")
-                torch.save(policy_net.state_dict(), f"pong_best.pth")
+                checkpointer.save(policy_net.state_dict(), "pong_best.pth")
                 best_reward = eval_reward
 
+        if episode % CHECKPOINT_FREQ == 0:
+            with telemetry.timer("checkpoint"):
+                # Les memmaps de la mémoire de rejeu sont écrits sur disque par le thread du Checkpointer
+                checkpointer.save({
+                    "policy_net": policy_net.state_dict(),
+                    "target_net": target_net.state_dict(),
+                    "optimizer": optimizer.state_dict(),
+                    "epsilon": epsilon,
+                    "step_count": step_count,
+                    "episode": episode,
+                    "best_reward": best_reward,
+                    "rng": rng_state(),
+                    "replay": memory.state_dict() if args.replay_dir is not None else None,
+                }, checkpoint_path, before=memory.flush)
+
+    if recorder is not None:
+        recorder.close()
+    checkpointer.close()
     env.close()
@@ -0,0 +1,130 @@
+import numpy as np
+from gym import spaces
+
+
+class VecPongEnv:
+    """Version vectorisée de PongEnv : N parties simulées en parallèle dans des tableaux NumPy.
+
+    Les règles (raquettes, rebonds, score) sont celles de PongEnv.step, appliquées
+    avec des masques. Les parties terminées sont relancées automatiquement ;
+    l'observation finale est alors disponible dans info["terminal_observation"].
+    """
+
+    def __init__(self, num_envs: int = 64, WIDTH: int = 1280, HEIGHT: int = 720, seed=None):
+        self.num_envs = num_envs
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
+
+        self.ball_radius = 10
+        self.paddle_width = 10
+        self.paddle_height = 100
+        self.paddle_speed = 10
+
+        self.paddle_player_x = 50
+        self.paddle_bot_x = self.WIDTH - self.paddle_width - 50
+
+        # Définition des actions : 0 = rien, 1 = haut et 2 = bas
+        self.action_space = spaces.Discrete(3)
+        self.observation_space = spaces.Box(
+            low = np.array([0, 0, -7, -7, 0, 0]),
+            high = np.array([self.WIDTH, self.HEIGHT, 7, 7, self.WIDTH, self.HEIGHT], dtype=np.float32),
+        )
+
+        self.rng = np.random.default_rng(seed)
+
+        # État de toutes les parties, un élément par environnement
+        self.ball_x = np.zeros(num_envs, dtype=np.int32)
+        self.ball_y = np.zeros(num_envs, dtype=np.int32)
+        self.ball_dx = np.zeros(num_envs, dtype=np.int32)
+        self.ball_dy = np.zeros(num_envs, dtype=np.int32)
+        self.paddle_player_y = np.zeros(num_envs, dtype=np.int32)
+        self.paddle_bot_y = np.zeros(num_envs, dtype=np.int32)
+
+        self._obs = np.empty((num_envs, 6), dtype=np.float32)
+        self._scale = np.array([1 / self.WIDTH, 1 / self.HEIGHT, 1 / 7, 1 / 7,
+                                1 / self.HEIGHT, 1 / self.HEIGHT], dtype=np.float32)
+
+    def _reset_envs(self, mask):
+        """Remet à zéro les parties sélectionnées par le masque."""
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return
+        self.ball_x[mask] = self.WIDTH // 2
+        self.ball_y[mask] = self.HEIGHT // 2
+        self.ball_dx[mask] = self.rng.choice([-7, 7], size=n)
+        self.ball_dy[mask] = self.rng.choice([-7, 7], size=n)
+        self.paddle_player_y[mask] = self.HEIGHT // 2 - self.paddle_height // 2
+        self.paddle_bot_y[mask] = self.HEIGHT // 2 - self.paddle_height // 2
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._get_obs()
+
+    def _get_obs(self):
+        obs = self._obs
+        obs[:, 0] = self.ball_x
+        obs[:, 1] = self.ball_y
+        obs[:, 2] = self.ball_dx
+        obs[:, 3] = self.ball_dy
+        obs[:, 4] = self.paddle_player_y
+        obs[:, 5] = self.paddle_bot_y
+        obs *= self._scale
+        return obs.copy()
+
+    def step(self, actions):
+        """Exécute une action par environnement et renvoie (obs, rewards, dones, info)."""
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+
+        #Mouvement du paddle du RL agent (left)
+        up = (actions == 1) & (self.paddle_player_y > -10)
+        down = (actions == 2) & (self.paddle_player_y < self.HEIGHT - self.paddle_height - 10)
+        self.paddle_player_y -= self.paddle_speed * up
+        self.paddle_player_y += self.paddle_speed * down
+
+        #Mouvement du paddle du bot (right)
+        center = self.paddle_bot_y + self.paddle_height // 2
+        self.paddle_bot_y += self.paddle_speed * (self.ball_y > center)
+        self.paddle_bot_y -= self.paddle_speed * (self.ball_y < center)
+
+        # Déplacement de la balle
+        self.ball_x += self.ball_dx
+        self.ball_y += self.ball_dy
+
+        # Rebond sur les bords haut et bas
+        wall = ((self.ball_y - self.ball_radius <= -10)
+                | (self.ball_y + self.ball_radius >= self.HEIGHT - 10))
+        np.negative(self.ball_dy, out=self.ball_dy, where=wall)
+
+        # Rebond sur raquette agent
+        left = self.ball_x - self.ball_radius
+        hit_player = ((self.paddle_player_x <= left) & (left <= self.paddle_player_x + self.paddle_width)
+                      & (self.paddle_player_y <= self.ball_y)
+                      & (self.ball_y <= self.paddle_player_y + self.paddle_height))
+        np.negative(self.ball_dx, out=self.ball_dx, where=hit_player)
+        rewards += hit_player
+
+        # Rebond sur raquette bot
+        right = self.ball_x + self.ball_radius
+        hit_bot = ((self.paddle_bot_x <= right) & (right <= self.paddle_bot_x + self.paddle_width)
+                   & (self.paddle_bot_y <= self.ball_y)
+                   & (self.ball_y <= self.paddle_bot_y + self.paddle_height))
+        np.negative(self.ball_dx, out=self.ball_dx, where=hit_bot)
+
+        lost = self.ball_x <= 0
+        won = self.ball_x >= self.WIDTH
+        rewards -= 2 * lost
+        rewards += 2 * won
+        dones = lost | won
+
+        info = {"hit": hit_player}
+        if dones.any():
+            info["terminal_observation"] = self._get_obs()[dones]
+            self._reset_envs(dones)
+
+        return self._get_obs(), rewards, dones, info
+
+    def close(self):
+        pass
@@ -0,0 +1,3 @@
+# Modules légers seulement : tracking, controls et frame_source (cv2) s'importent explicitement
+from .pipeline import Detection, RateMeter, LatestFrameCapture, AsyncDetector, VisionPipeline
+from .detector import ROIDetector
@@ -0,0 +1,224 @@
+import os
+import sys
+import time
+import signal
+import argparse
+import threading
+from collections import namedtuple
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+from .frame_source import FrameSource, open_source
+
+SHM_NAME = "yolo_project_camera"
+# Source utilisée quand aucune n'est précisée : index de caméra, fichier vidéo, dossier d'images ou "synthetic"
+DEFAULT_SOURCE = os.environ.get("YOLO_CAMERA", "0")
+
+MAGIC = 0x594F4C4F  # "YOLO"
+HEADER = 64  # magic, seq, width, height, channels, slots (int64)
+
+Frame = namedtuple("Frame", ["seq", "timestamp", "image"])
+
+
+def _attach(name):
+    """Ouvre un segment existant sans que ce processus le détruise à sa sortie."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class _Ring:
+    """Vues NumPy sur le segment partagé : en-tête, numéro et horodatage par case, images."""
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.header = np.ndarray((HEADER // 8,), dtype=np.int64, buffer=shm.buf)
+        _, _, width, height, channels, slots = self.header[:6]
+        self.shape = (int(height), int(width), int(channels))
+        self.slots = int(slots)
+        self.slot_seq = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=HEADER)
+        self.slot_time = np.ndarray((self.slots,), dtype=np.float64, buffer=shm.buf, offset=HEADER + 8 * self.slots)
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=shm.buf,
+                                 offset=HEADER + 16 * self.slots)
+
+    @staticmethod
+    def size(shape, slots):
+        return HEADER + 16 * slots + slots * int(np.prod(shape))
+
+    def release(self):
+        # Les vues doivent disparaître avant de fermer le segment
+        del self.header, self.slot_seq, self.slot_time, self.frames
+        self.shm.close()
+
+
+class CameraService:
+    """Capture une seule fois et publie les images dans un anneau de `slots` cases en mémoire partagée.
+
+    Chaque case porte le numéro (seq) et l'instant (perf_counter) de son image. Pendant
+    l'écriture d'une case son numéro vaut -1 : un lecteur qui voit le numéro changer
+    pendant sa lecture sait que l'image a été écrasée.
+    """
+
+    def __init__(self, source=None, name=SHM_NAME, slots=8, width=None, height=None):
+        self.cap = open_source(DEFAULT_SOURCE if source is None else source, width, height)
+        ret, frame = self.cap.read()
+        if not ret:
+            raise RuntimeError(f"Impossible de lire la source {source!r}")
+        if frame.ndim == 2:
+            frame = frame[:, :, None]
+
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=_Ring.size(frame.shape, slots))
+        header = np.ndarray((HEADER // 8,), dtype=np.int64, buffer=self.shm.buf)
+        header[:6] = (MAGIC, 0, frame.shape[1], frame.shape[0], frame.shape[2], slots)
+        del header
+        self.ring = _Ring(self.shm)
+        self.ring.slot_seq[:] = 0
+        self.seq = 0
+        self.running = False
+        self.thread = None
+        self._publish(frame)
+
+    def _publish(self, frame):
+        ring = self.ring
+        seq = self.seq + 1
+        i = seq % ring.slots
+        ring.slot_seq[i] = -1
+        ring.frames[i] = frame.reshape(ring.shape)
+        ring.slot_time[i] = time.perf_counter()
+        ring.slot_seq[i] = seq
+        ring.header[1] = seq
+        self.seq = seq
+
+    def step(self):
+        ret, frame = self.cap.read()
+        if ret:
+            self._publish(frame)
+        return ret
+
+    def serve(self):
+        """Boucle de capture (bloquante)."""
+        self.running = True
+        while self.running:
+            if not self.step():
+                time.sleep(0.01)
+
+    def start(self):
+        """Lance la capture dans un thread du processus courant."""
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.cap.release()
+        self.ring.release()
+        self.shm.unlink()
+
+
+class SharedCamera(FrameSource):
+    """Lecteur du flux publié par CameraService ; plusieurs lecteurs peuvent s'attacher au même flux.
+
+    next_frame(copy=False) renvoie une vue en lecture seule sur la case de l'anneau, sans copie :
+    elle reste valable tant que le service n'a pas fait le tour de l'anneau (voir is_current).
+    read() imite cv2.VideoCapture.read et renvoie une copie modifiable.
+    """
+
+    def __init__(self, name=SHM_NAME):
+        super().__init__()
+        self.ring = _Ring(_attach(name))
+        if self.ring.header[0] != MAGIC:
+            self.ring.release()
+            raise ValueError(f"Le segment {name!r} n'est pas un flux CameraService")
+        self.last_seq = 0
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def latest_seq(self):
+        return int(self.ring.header[1])
+
+    def is_current(self, seq):
+        """True si la case de l'image `seq` n'a pas encore été réécrite."""
+        return int(self.ring.slot_seq[seq % self.ring.slots]) == seq
+
+    def next_frame(self, after=None, timeout=1.0, copy=False):
+        """Attend une image plus récente que `after` (par défaut la dernière lue) ; None si délai dépassé."""
+        after = self.last_seq if after is None else after
+        deadline = time.perf_counter() + timeout
+        while True:
+            seq = self.latest_seq()
+            if seq > after:
+                i = seq % self.ring.slots
+                timestamp = float(self.ring.slot_time[i])
+                image = self.ring.frames[i]
+                if copy:
+                    image = image.copy()
+                else:
+                    image = image.view()
+                    image.flags.writeable = False
+                if self.is_current(seq):
+                    self.last_seq = seq
+                    return Frame(seq, timestamp, image)
+                continue  # case réécrite pendant la lecture : on prend la suivante
+            if time.perf_counter() > deadline:
+                return None
+            time.sleep(0.001)
+
+    def read(self):
+        frame = self.next_frame(copy=True)
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def release(self):
+        if self.opened:
+            self.opened = False
+            self.ring.release()
+
+
+def open_camera(source=None, name=SHM_NAME, width=None, height=None):
+    """Flux du CameraService s'il tourne et qu'aucune source n'est imposée, sinon ouverture directe.
+
+    source peut être toute source acceptée par open_source, y compris une FrameSource.
+    width/height sont demandés à une caméra ouverte directement (YOLO_CAMERA compris) ;
+    le flux partagé garde la résolution du service (--width/--height).
+    L'objet renvoyé a l'interface de cv2.VideoCapture (read, isOpened, release).
+    """
+    if source is None:
+        try:
+            return SharedCamera(name)
+        except FileNotFoundError:
+            source = DEFAULT_SOURCE
+    return open_source(source, width, height)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Service caméra partagé entre les jeux")
+    parser.add_argument("--source", default=None,
+                        help="index de caméra, fichier vidéo, dossier d'images ou synthetic (YOLO_CAMERA)")
+    parser.add_argument("--name", default=SHM_NAME, help="nom du segment de mémoire partagée")
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--width", type=int, default=None, help="largeur demandée à la caméra")
+    parser.add_argument("--height", type=int, default=None, help="hauteur demandée à la caméra")
+    args = parser.parse_args()
+
+    # Arrêt propre (libération du segment) aussi sur SIGTERM
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    service = CameraService(args.source, args.name, args.slots, args.width, args.height).start()
+    print(f"Flux {args.name} : {service.ring.shape[1]}x{service.ring.shape[0]}, {args.slots} cases")
+    try:
+        last_seq, last_time = service.seq, time.perf_counter()
+        while True:
+            time.sleep(5)
+            now = time.perf_counter()
+            print(f"{(service.seq - last_seq) / (now - last_time):.1f} FPS, image {service.seq}")
+            last_seq, last_time = service.seq, now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,84 @@
+import numpy as np
+import cv2
+from .tracking import box_points
+
+# Détecteurs des jeux, au format de DetectionScheduler : detect(frame) -> (value, points)
+
+
+def yolo_detector(model, labels, roi=True, imgsz=320):
+    """Pong : label de l'objet de contrôle détecté par YOLO et grille de points dans sa boîte.
+
+    roi=True : ROIDetector (classes de contrôle, entrée réduite, recadrage) ;
+    roi=False : toutes les classes sur l'image entière.
+    """
+    if roi:
+        from .detector import ROIDetector
+        detector = ROIDetector(model, labels, imgsz=imgsz)
+
+        def detect(frame):
+            label = detector(frame)
+            if label is None:
+                return None, None
+            return label, box_points(detector.last_box)
+        return detect
+
+    def detect(frame):
+        detected_object = None
+        detected_box = None
+        for r in model(frame):
+            for box in r.boxes:
+                label = model.names[int(box.cls[0])]
+                if label in labels:
+                    detected_object = label
+                    detected_box = box.xyxy[0].cpu().numpy()
+        if detected_object is None:
+            return None, None
+        return detected_object, box_points(detected_box)
+    return detect
+
+
+def wrist_detector(hands):
+    """BreakOut : position du poignet de la première main (MediaPipe Hands)."""
+    import mediapipe as mp
+    wrist_index = mp.solutions.hands.HandLandmark.WRIST
+
+    def detect(frame):
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not results.multi_hand_landmarks:
+            return None, None
+        wrist = results.multi_hand_landmarks[0].landmark[wrist_index]
+        return None, [(wrist.x * frame.shape[1], wrist.y * frame.shape[0])]
+    return detect
+
+
+def fingers_detector(hands):
+    """Motus : pouce et index de chaque main détectée, en pixels (2 points par main)."""
+    def detect(frame):
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not results.multi_hand_landmarks:
+            return None, None
+        h, w, _ = frame.shape
+        points = []
+        for hand_landmarks in results.multi_hand_landmarks:
+            thumb_tip = hand_landmarks.landmark[4]
+            index_tip = hand_landmarks.landmark[8]
+            points += [(thumb_tip.x * w, thumb_tip.y * h), (index_tip.x * w, index_tip.y * h)]
+        return None, points
+    return detect
+
+
+def bright_blob_detector(threshold=190, min_area=100):
+    """Détecteur classique sans modèle : plus grande tache claire (formes de SyntheticSource)."""
+    def detect(frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        _, mask = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        if n < 2:
+            return None, None
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        best = int(np.argmax(areas)) + 1
+        if areas[best - 1] < min_area:
+            return None, None
+        x, y, w, h = stats[best, :4]
+        return "blob", box_points((x, y, x + w, y + h))
+    return detect
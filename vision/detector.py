@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class ROIDetector:
+    """Détection YOLO restreinte aux classes de contrôle, sur une région autour de la dernière détection.
+
+    - seules les classes `labels` sont demandées au modèle (paramètre classes de YOLO),
+      avec une taille d'entrée réduite `imgsz` ;
+    - une fois l'objet trouvé, l'image suivante est recadrée sur sa boîte élargie de `margin` ;
+    - si l'objet est perdu, la région grandit d'un facteur `grow` à chaque échec
+      jusqu'à redevenir l'image entière ;
+    - les boîtes sont traitées en NumPy, sans boucle Python.
+
+    Un appel renvoie le label de la boîte la plus sûre, ou None.
+    """
+
+    def __init__(self, model, labels=("bottle", "cell phone"), imgsz=320, conf=0.25, margin=1.0, grow=1.5):
+        self.model = model
+        self.labels = list(labels)
+        name_to_id = {name: i for i, name in model.names.items()}
+        self.class_ids = [name_to_id[label] for label in self.labels]
+        self.id_to_label = np.array([model.names[i] for i in range(max(model.names) + 1)], dtype=object)
+        self.imgsz = imgsz
+        self.conf = conf
+        self.margin = margin
+        self.grow = grow
+        self.roi = None  # (x1, y1, x2, y2) en pixels de l'image complète, None = image entière
+        self.last_box = None
+        self.full_frames = 0
+        self.roi_frames = 0
+
+    def _expand(self, box, factor, width, height):
+        """Boîte agrandie de `factor` autour de son centre, limitée à l'image."""
+        x1, y1, x2, y2 = box
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        half_w, half_h = (x2 - x1) * factor / 2, (y2 - y1) * factor / 2
+        # Pas plus petit que l'entrée du modèle : un recadrage minuscule serait agrandi et flou
+        half_w, half_h = max(half_w, self.imgsz / 2), max(half_h, self.imgsz / 2)
+        roi = (max(0, int(cx - half_w)), max(0, int(cy - half_h)),
+               min(width, int(cx + half_w)), min(height, int(cy + half_h)))
+        if roi == (0, 0, width, height):
+            return None
+        return roi
+
+    def __call__(self, frame):
+        height, width = frame.shape[:2]
+        if self.roi is None:
+            x0, y0 = 0, 0
+            image = frame
+            self.full_frames += 1
+        else:
+            x0, y0, x1, y1 = self.roi
+            image = frame[y0:y1, x0:x1]
+            self.roi_frames += 1
+
+        result = self.model(image, classes=self.class_ids, imgsz=self.imgsz, conf=self.conf, verbose=False)[0]
+        boxes = result.boxes
+        if len(boxes) == 0:
+            # Objet perdu : on élargit la région autour de la dernière position connue
+            if self.roi is not None:
+                self.roi = self._expand(self.roi, self.grow, width, height)
+            return None
+
+        confidences = boxes.conf.cpu().numpy()
+        best = int(confidences.argmax())
+        xyxy = boxes.xyxy.cpu().numpy()[best] + np.array([x0, y0, x0, y0], dtype=np.float32)
+        label = self.id_to_label[int(boxes.cls.cpu().numpy()[best])]
+
+        self.last_box = xyxy
+        self.roi = self._expand(xyxy, 1 + 2 * self.margin, width, height)
+        return label
+
+    def reset(self):
+        self.roi = None
+        self.last_box = None
@@ -0,0 +1,182 @@
+import os
+import time
+import numpy as np
+import cv2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """Source d'images BGR uint8 avec l'interface de cv2.VideoCapture : read() -> (ret, frame).
+
+    fps > 0 cadence la lecture en temps réel (comme une caméra), fps = 0 lit aussi vite que possible.
+    Une source peut aussi être parcourue avec `for frame in source`.
+    """
+
+    def __init__(self, fps=0):
+        self.fps = fps
+        self.next_time = None
+
+    def _pace(self):
+        if not self.fps:
+            return
+        now = time.perf_counter()
+        if self.next_time is not None and self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time = max((self.next_time or now) + 1 / self.fps, time.perf_counter())
+
+    def read(self):
+        raise NotImplementedError
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            ret, frame = self.read()
+            if not ret:
+                return
+            yield frame
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class CameraSource(FrameSource):
+    """Caméra réelle (cadencée par le périphérique)."""
+
+    def __init__(self, index=0, width=None, height=None):
+        super().__init__()
+        self.cap = cv2.VideoCapture(index)
+        if width is not None:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height is not None:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Fichier vidéo, relu en boucle si loop ; realtime=True le cadence à son propre FPS."""
+
+    def __init__(self, path, loop=True, realtime=False):
+        self.cap = cv2.VideoCapture(path)
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS) if realtime else 0)
+        self.loop = loop
+
+    def read(self):
+        self._pace()
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirSource(FrameSource):
+    """Images d'un dossier dans l'ordre alphabétique (par exemple une séquence de main enregistrée)."""
+
+    def __init__(self, path, loop=True, fps=0):
+        super().__init__(fps)
+        self.files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.files:
+            raise FileNotFoundError(f"Aucune image dans {path}")
+        self.loop = loop
+        self.index = 0
+
+    def read(self):
+        if self.index == len(self.files):
+            if not self.loop:
+                return False, None
+            self.index = 0
+        self._pace()
+        frame = cv2.imread(self.files[self.index], cv2.IMREAD_COLOR)
+        self.index += 1
+        return frame is not None, frame
+
+
+class SyntheticSource(FrameSource):
+    """Images générées : des formes claires et texturées qui rebondissent sur un fond texturé plus sombre.
+
+    Déterministe pour une graine donnée ; n_frames limite la séquence (clip fixe),
+    None la rend infinie. Les boîtes des formes de la dernière image sont dans `boxes`.
+    """
+
+    def __init__(self, width=640, height=480, fps=30, n_frames=None, n_shapes=1, size=80, seed=0):
+        super().__init__(fps)
+        rng = np.random.default_rng(seed)
+        # Fond et formes texturés (le flux optique a besoin de détails), agrandis sans lissage ;
+        # les formes (200-255) restent plus claires que le fond (0-159)
+        noise = rng.integers(0, 160, (height // 8, width // 8, 3), dtype=np.uint8)
+        self.background = cv2.resize(noise, (width, height), interpolation=cv2.INTER_NEAREST)
+        sprite = rng.integers(200, 256, (size // 4, size // 4, 3), dtype=np.uint8)
+        self.sprite = cv2.resize(sprite, (size, size), interpolation=cv2.INTER_NEAREST)
+        self.circle = np.zeros((size, size), dtype=np.uint8)
+        cv2.circle(self.circle, (size // 2, size // 2), size // 2, 1, -1)
+        self.circle = self.circle.astype(bool)
+        self.width = width
+        self.height = height
+        self.size = size
+        self.n_frames = n_frames
+        self.count = 0
+        self.positions = rng.integers(0, [width - size, height - size], (n_shapes, 2))
+        self.velocities = rng.choice([-9, -7, -5, 5, 7, 9], (n_shapes, 2))
+        self.boxes = None
+
+    def read(self):
+        if self.n_frames is not None and self.count >= self.n_frames:
+            return False, None
+        self._pace()
+        self.count += 1
+
+        self.positions += self.velocities
+        limits = np.array([self.width - self.size, self.height - self.size])
+        out = (self.positions < 0) | (self.positions > limits)
+        self.velocities[out] = -self.velocities[out]
+        self.positions = np.clip(self.positions, 0, limits)
+
+        frame = self.background.copy()
+        for k, (x, y) in enumerate(self.positions):
+            patch = frame[y:y + self.size, x:x + self.size]
+            if k % 2 == 0:
+                patch[:] = self.sprite
+            else:
+                patch[self.circle] = self.sprite[self.circle]
+        self.boxes = np.concatenate([self.positions, self.positions + self.size], axis=1)
+        return True, frame
+
+
+def open_source(source, width=None, height=None):
+    """Ouvre une source : FrameSource déjà construite, index de caméra, "synthetic",
+    dossier d'images ou fichier vidéo. width/height : résolution demandée à une caméra."""
+    if isinstance(source, FrameSource):
+        return source
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if isinstance(source, int):
+        return CameraSource(source, width, height)
+    if source == "synthetic":
+        return SyntheticSource()
+    if os.path.isdir(source):
+        return ImageDirSource(source)
+    return VideoFileSource(source)
@@ -0,0 +1,126 @@
+import os
+import csv
+import time
+import numpy as np
+import pygame as pg
+
+# Instants enregistrés pour chaque image de la caméra qui a fait bouger le jeu
+STAMPS = ("captured", "detected", "controlled", "presented")
+# Intervalles affichés : (nom, instant de début, instant de fin)
+INTERVALS = (
+    ("inference", "captured", "detected"),
+    ("handoff", "detected", "controlled"),
+    ("render", "controlled", "presented"),
+    ("total", "captured", "presented"),
+)
+
+
+class LatencyTracer:
+    """Latence de bout en bout, de la capture de l'image à son affichage à l'écran.
+
+    Chaque détection utilisée par le jeu porte les instants (perf_counter) de capture et de fin
+    d'inférence ; control() ajoute l'instant où le jeu l'applique et presented(), appelé après
+    pg.display.flip(), celui de l'affichage. Les traces complètes vont dans un anneau de
+    `window` lignes d'où sont tirés les percentiles ; frame() mesure en plus la durée des images.
+    """
+
+    def __init__(self, window=1000, path=None):
+        self.path = path
+        self.traces = np.zeros((window, len(STAMPS) + 1), dtype=np.float64)  # seq + instants
+        self.count = 0
+        self.frame_times = np.zeros(window, dtype=np.float64)
+        self.frames = 0
+        self.last_frame = None
+        self.pending = None
+        self.last_seq = None
+
+        self.hud = False
+        self.font = None
+        self.hud_surface = None
+        self.hud_frame = 0
+
+    def control(self, seq, captured_at, detected_at):
+        """Le jeu applique la détection `seq` ; chaque détection n'est tracée qu'une fois."""
+        if seq == self.last_seq:
+            return
+        self.last_seq = seq
+        self.pending = (seq, captured_at, detected_at, time.perf_counter())
+
+    def presented(self):
+        """À appeler juste après pg.display.flip()."""
+        now = time.perf_counter()
+        if self.pending is not None:
+            self.traces[self.count % len(self.traces)] = self.pending + (now,)
+            self.count += 1
+            self.pending = None
+        self.frame(now)
+
+    def frame(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.last_frame is not None:
+            self.frame_times[self.frames % len(self.frame_times)] = now - self.last_frame
+            self.frames += 1
+        self.last_frame = now
+
+    def _rows(self):
+        return self.traces[:min(self.count, len(self.traces))]
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """Percentiles (ms) de chaque intervalle et de la durée des images."""
+        rows = self._rows()
+        result = {"traces": self.count}
+        if len(rows):
+            for name, start, end in INTERVALS:
+                values = (rows[:, 1 + STAMPS.index(end)] - rows[:, 1 + STAMPS.index(start)]) * 1000
+                for p, value in zip(percentiles, np.percentile(values, percentiles)):
+                    result[f"{name}_p{p}_ms"] = float(value)
+        if self.frames:
+            frame_times = self.frame_times[:min(self.frames, len(self.frame_times))] * 1000
+            for p, value in zip(percentiles, np.percentile(frame_times, percentiles)):
+                result[f"frame_p{p}_ms"] = float(value)
+        return result
+
+    def toggle_hud(self):
+        self.hud = not self.hud
+
+    def draw_hud(self, screen, refresh=15):
+        """Affiche les percentiles en haut à gauche ; le texte n'est recalculé que toutes les `refresh` images.
+
+        Renvoie la zone de l'écran dessinée (None si le HUD est masqué).
+        """
+        if not self.hud:
+            return None
+        self.hud_frame += 1
+        if self.hud_surface is None or self.hud_frame % refresh == 0:
+            if self.font is None:
+                self.font = pg.font.Font(None, 22)
+            stats = self.summary()
+            lines = [f"{name:<9} p50 {stats[f'{name}_p50_ms']:6.1f} ms  p95 {stats[f'{name}_p95_ms']:6.1f} ms"
+                     for name, _, _ in INTERVALS + (("frame", None, None),) if f"{name}_p50_ms" in stats]
+            lines = lines or ["en attente de mesures"]
+            surfaces = [self.font.render(line, True, (255, 255, 0)) for line in lines]
+            self.hud_surface = pg.Surface((max(s.get_width() for s in surfaces) + 10, 20 * len(surfaces) + 6),
+                                          pg.SRCALPHA)
+            self.hud_surface.fill((0, 0, 0, 160))
+            for i, surface in enumerate(surfaces):
+                self.hud_surface.blit(surface, (5, 4 + 20 * i))
+        return screen.blit(self.hud_surface, (10, 10))
+
+    def dump(self, path=None):
+        """Écrit les traces de l'anneau en CSV (instants bruts en secondes et intervalles en ms)."""
+        path = path or self.path
+        if path is None:
+            return None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        rows = self._rows()
+        order = np.argsort(rows[:, 0], kind="stable")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("seq",) + STAMPS + tuple(f"{name}_ms" for name, _, _ in INTERVALS))
+            for row in rows[order]:
+                intervals = [(row[1 + STAMPS.index(end)] - row[1 + STAMPS.index(start)]) * 1000
+                             for _, start, end in INTERVALS]
+                writer.writerow([int(row[0])] + list(row[1:]) + intervals)
+        return path
@@ -0,0 +1,178 @@
+import time
+import threading
+from collections import deque, namedtuple
+
+# Résultat publié par le détecteur : numéro et instant de capture de l'image analysée,
+# instant de fin d'inférence et valeur renvoyée par la fonction de détection
+Detection = namedtuple("Detection", ["seq", "captured_at", "detected_at", "value"])
+
+
+class RateMeter:
+    """Débit (événements par seconde) sur les `window` derniers événements."""
+
+    def __init__(self, window=60):
+        self.times = deque(maxlen=window)
+
+    def tick(self):
+        self.times.append(time.perf_counter())
+
+    def rate(self):
+        if len(self.times) < 2:
+            return 0.0
+        return (len(self.times) - 1) / max(self.times[-1] - self.times[0], 1e-9)
+
+
+class LatestFrameCapture:
+    """Thread de capture qui ne garde que la dernière image de la caméra.
+
+    Une image non lue avant l'arrivée de la suivante est écrasée et comptée
+    dans `dropped` : le consommateur voit toujours l'image la plus récente.
+    """
+
+    def __init__(self, source=None):
+        from .camera_service import open_camera
+        self.cap = open_camera(source)
+        self.condition = threading.Condition()
+        self.frame = None
+        self.seq = 0
+        self.captured_at = 0.0
+        self.read_seq = 0
+        self.dropped = 0
+        self.failures = 0
+        self.meter = RateMeter()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _loop(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                self.failures += 1
+                time.sleep(0.01)
+                continue
+            with self.condition:
+                if self.seq > self.read_seq:
+                    self.dropped += 1
+                self.frame = frame
+                self.seq += 1
+                self.captured_at = time.perf_counter()
+                self.meter.tick()
+                self.condition.notify_all()
+
+    def read(self, after=0, timeout=1.0):
+        """Attend une image plus récente que `after` ; renvoie (seq, captured_at, frame) ou None."""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.seq > after or not self.running, timeout):
+                return None
+            if self.frame is None:
+                return None
+            self.read_seq = self.seq
+            return self.seq, self.captured_at, self.frame
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.cap.release()
+
+
+class AsyncDetector:
+    """Thread d'inférence : applique `detect(frame)` à la dernière image capturée et publie le résultat.
+
+    latest() ne bloque jamais : elle renvoie la dernière Detection publiée (ou None).
+    Une exception de `detect` arrête le thread et est relancée par latest(), dans la boucle de jeu.
+    """
+
+    def __init__(self, capture, detect):
+        self.capture = capture
+        self.detect = detect
+        self.result = None
+        self.inferences = 0
+        self.latency = deque(maxlen=60)
+        self.meter = RateMeter()
+        self.error = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _loop(self):
+        last_seq = 0
+        while self.running:
+            item = self.capture.read(after=last_seq)
+            if item is None:
+                continue
+            seq, captured_at, frame = item
+            last_seq = seq
+            try:
+                value = self.detect(frame)
+            except Exception as e:
+                self.error = e
+                self.running = False
+                break
+            detected_at = time.perf_counter()
+            # Remplacement d'une référence : atomique, pas besoin de verrou pour latest()
+            self.result = Detection(seq, captured_at, detected_at, value)
+            self.inferences += 1
+            self.latency.append(detected_at - captured_at)
+            self.meter.tick()
+
+    def latest(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+
+class VisionPipeline:
+    """Capture et détection asynchrones : la boucle de jeu lit le dernier résultat sans attendre."""
+
+    def __init__(self, source, detect):
+        self.capture = LatestFrameCapture(source)
+        self.detector = AsyncDetector(self.capture, detect)
+
+    def start(self):
+        self.capture.start()
+        self.detector.start()
+        return self
+
+    def latest(self, max_age=None):
+        """Dernière Detection, ou None si aucune ou si elle date de plus de max_age secondes."""
+        result = self.detector.latest()
+        if result is None:
+            return None
+        if max_age is not None and time.perf_counter() - result.captured_at > max_age:
+            return None
+        return result
+
+    def stats(self):
+        latency = sorted(self.detector.latency)
+        return {
+            "capture_fps": self.capture.meter.rate(),
+            "inference_fps": self.detector.meter.rate(),
+            "captured": self.capture.seq,
+            "dropped": self.capture.dropped,  # images jamais analysées (détecteur occupé)
+            "inferences": self.detector.inferences,
+            "latency_ms": latency[len(latency) // 2] * 1000 if latency else None,
+            "error": repr(self.detector.error) if self.detector.error is not None else None,
+        }
+
+    def stop(self):
+        self.detector.stop()
+        self.capture.stop()
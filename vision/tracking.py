@@ -0,0 +1,137 @@
+import time
+from collections import deque, namedtuple
+import numpy as np
+import cv2
+
+# value : valeur renvoyée par la dernière détection (label, etc.)
+# points : points suivis (N, 2) en pixels, None si la cible est perdue
+# detected : True si le détecteur a tourné sur cette image, False si les points viennent du suivi
+Track = namedtuple("Track", ["value", "points", "detected"])
+
+
+def box_points(xyxy, n=3, inset=0.0):
+    """Grille n x n de points d'une boîte (x1, y1, x2, y2), bords compris si inset=0.
+
+    Les coins et les bords tombent sur le contour de l'objet, là où le flux optique a prise ;
+    l'intérieur d'un objet uni ne se suit pas mais est déplacé avec les autres points.
+    """
+    x1, y1, x2, y2 = xyxy
+    xs = np.linspace(x1 + (x2 - x1) * inset, x2 - (x2 - x1) * inset, n)
+    ys = np.linspace(y1 + (y2 - y1) * inset, y2 - (y2 - y1) * inset, n)
+    return np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+
+
+class DetectionScheduler:
+    """Lance le détecteur lourd une image sur `every`, suit la cible par flux optique entre deux détections.
+
+    detect(frame) renvoie (value, points) : une valeur quelconque et les points à suivre
+    ((N, 2) en pixels), ou (value, None) si rien n'est détecté. Entre deux détections
+    les points sont propagés par Lucas-Kanade pyramidal ; si le suivi perd un point ou
+    que son erreur dépasse max_error, la détection est relancée dès l'image suivante.
+    Si moins de `min_valid` des points sont suivis, la cible est perdue ; les autres
+    points sont déplacés du mouvement médian des points suivis.
+
+    stats() rapporte le temps de détection économisé et la dérive du suivi, mesurée à chaque
+    détection programmée comme l'écart entre la position suivie et la position détectée.
+    """
+
+    def __init__(self, detect, every=5, max_error=20.0, min_valid=0.5, win_size=21, levels=3):
+        self.detect = detect
+        self.every = every
+        self.max_error = max_error
+        self.min_valid = min_valid
+        self.lk_params = dict(winSize=(win_size, win_size), maxLevel=levels,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        self.value = None
+        self.points = None
+        self.prev_gray = None
+        self.since_detection = 0
+        self.lost = True
+
+        self.detections = 0
+        self.tracked = 0
+        self.detect_time = 0.0
+        self.track_time = 0.0
+        # Coût du suivi lancé sur les images détectées, uniquement pour mesurer la dérive
+        self.drift_time = 0.0
+        self.drift = deque(maxlen=200)
+
+    def _flow(self, gray):
+        """Propage self.points de l'image précédente à `gray` ; renvoie (points, ok)."""
+        previous = self.points.reshape(-1, 1, 2).astype(np.float32)
+        points, status, error = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, previous, None, **self.lk_params)
+        previous, points = previous.reshape(-1, 2), points.reshape(-1, 2)
+        valid = (status.reshape(-1) == 1) & (error.reshape(-1) <= self.max_error)
+        if valid.sum() < max(1, self.min_valid * len(valid)):
+            return points, False
+        motion = np.median(points[valid] - previous[valid], axis=0)
+        points[~valid] = previous[~valid] + motion
+        return points, True
+
+    def __call__(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        can_track = self.points is not None and self.prev_gray is not None and not self.lost
+
+        if can_track and self.since_detection < self.every - 1:
+            start = time.perf_counter()
+            points, ok = self._flow(gray)
+            self.track_time += time.perf_counter() - start
+            self.prev_gray = gray
+            if ok:
+                self.points = points
+                self.since_detection += 1
+                self.tracked += 1
+                return Track(self.value, points, False)
+            # Suivi peu fiable : cible considérée perdue, on redétecte à l'image suivante
+            self.lost = True
+            return Track(None, None, False)
+
+        # Position prédite par le suivi, pour mesurer sa dérive par rapport à la détection
+        predicted = None
+        if can_track:
+            start = time.perf_counter()
+            predicted, ok = self._flow(gray)
+            self.drift_time += time.perf_counter() - start
+            if not ok:
+                predicted = None
+
+        start = time.perf_counter()
+        value, points = self.detect(frame)
+        self.detect_time += time.perf_counter() - start
+        self.detections += 1
+
+        if points is not None:
+            points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+            if predicted is not None and len(predicted) == len(points):
+                self.drift.append(float(np.linalg.norm(predicted - points, axis=1).mean()))
+        self.value = value
+        self.points = points
+        self.prev_gray = gray
+        self.since_detection = 0
+        self.lost = points is None
+        return Track(value, points, True)
+
+    def stats(self):
+        mean_detect = self.detect_time / self.detections if self.detections else 0.0
+        mean_track = self.track_time / self.tracked if self.tracked else 0.0
+        drift = sorted(self.drift)
+        return {
+            "detections": self.detections,
+            "tracked": self.tracked,
+            "detect_ms": mean_detect * 1000,
+            "track_ms": mean_track * 1000,
+            "drift_ms": self.drift_time / self.detections * 1000 if self.detections else 0.0,
+            # Temps qu'auraient coûté des détections sur les images suivies, moins le coût du suivi
+            # et de la mesure de dérive
+            "saved_s": self.tracked * mean_detect - self.track_time - self.drift_time,
+            "drift_px_mean": sum(drift) / len(drift) if drift else None,
+            "drift_px_p95": drift[min(len(drift) - 1, int(len(drift) * 0.95))] if drift else None,
+        }
+
+    def format_stats(self):
+        stats = self.stats()
+        line = (f"Détections : {stats['detections']} ({stats['detect_ms']:.1f} ms) | "
+                f"suivi : {stats['tracked']} ({stats['track_ms']:.2f} ms) | économisé : {stats['saved_s']:.1f} s")
+        if stats["drift_px_mean"] is not None:
+            line += f" | dérive : {stats['drift_px_mean']:.1f} px (p95 {stats['drift_px_p95']:.1f})"
+        return line